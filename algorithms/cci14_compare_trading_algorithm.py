@@ -85,13 +85,13 @@ class CCI14_Compare_TradingAlgorithm(TradingAlgorithm):
 			if prev_cci < 0 and current_cci > prev_cci and price > self.ema_slow:
 				self.signal_time = datetime.datetime.now()
 				self.signal_action = 'BUY'
-				self.log(f"{time_str} 📈 LONG signal detected: CCI {prev_cci:.2f} -> {current_cci:.2f} | Price {price} > EMA Slow {self.ema_slow}")
+				self.log(f"{time_str} 📈 LONG signal detected: CCI {prev_cci:.2f} -> {current_cci:.2f} | Price {price} > EMA Slow {self._r4(self.ema_slow)}")
 			
 			# Short signal:   
 			elif prev_cci > 0 and current_cci < prev_cci and price < self.ema_slow:
 				self.signal_time = datetime.datetime.now()
 				self.signal_action = 'SELL'
-				self.log(f"{time_str} 📉 SHORT signal detected: CCI {prev_cci:.2f} -> {current_cci:.2f} | Price {price} < EMA Slow {self.ema_slow}")
+				self.log(f"{time_str} 📉 SHORT signal detected: CCI {prev_cci:.2f} -> {current_cci:.2f} | Price {price} < EMA Slow {self._r4(self.ema_slow)}")
 		
 		# Execute after 3-minute delay
 		if self.signal_time is not None:
@@ -39,7 +39,7 @@ class CCI14TradingAlgorithm(TradingAlgorithm):
 		if len(prices) < self.CCI_PERIOD:
 			self.log(f"{time_str} ⚠️ Not enough data for CCI")
 			return None
-		typical_prices = prices[-self.CCI_PERIOD:]
+		typical_prices = self._tail(prices, self.CCI_PERIOD)
 		avg_tp = mean(typical_prices)
 		dev = stdev(typical_prices)
 		if dev == 0:
@@ -67,9 +67,8 @@ class CCI14TradingAlgorithm(TradingAlgorithm):
 		if len(self.price_history) >= self.CCI_PERIOD:
 			cci = self.calculate_and_log_cci(self.price_history, time_str)
 			if cci is not None:
-				self.cci_values.append(cci)
-				if len(self.cci_values) > 100:
-					self.cci_values = self.cci_values[-100:]
+				# Bounded to the latest 100 values, trimmed in place (see TradingAlgorithm._append_cci_value)
+				self._append_cci_value(cci)
 		# Check for active position
 		if self.has_active_position():
 			self.log(f"{time_str} 🚫 BLOCKED: Trade already active\n")
@@ -80,9 +80,8 @@ class CCI14_200_TradingAlgorithm(CCI14_Compare_TradingAlgorithm):
             # Reuse parent's calculation helper
             cci = self.calculate_and_log_cci(self.price_history, time_str)
             if cci is not None:
-                self.cci_values.append(cci)
-                if len(self.cci_values) > 100:
-                    self.cci_values = self.cci_values[-100:]
+                # Bounded to the latest 100 values, trimmed in place (see TradingAlgorithm._append_cci_value)
+                self._append_cci_value(cci)
 
         # Block if already in a position
         if self.has_active_position():
@@ -176,10 +176,8 @@ class EMATradingAlgorithm(TradingAlgorithm):
 		ema = sma
 		
 		# Apply EMA calculation using existing multiplier
-		for price in price_data[20:]:
-			ema = (price - ema) * self.K + ema
-			
-		return ema
+		series = self._ema_series(price_data[20:], self.K, ema)
+		return series[-1] if series else ema
 
 	def execute_trade(self, action, time_str, price, is_override=False):
 		"""Execute trade and reset state"""
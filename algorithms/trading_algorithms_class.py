@@ -1,138 +1,159 @@
 from ib_insync import *
-import datetime, time, math, functools, types, os, threading, atexit, asyncio, logging
+import datetime, time, math, functools, itertools, os, sys, threading, atexit, asyncio, logging, queue, struct, random, errno
 import logging.handlers
 import traceback
+import csv
+from statistics import mean, stdev
+from collections import deque
 from typing import Optional
 from zoneinfo import ZoneInfo
+try:
+	# Only used to recognise test doubles in get_valid_price; resolved once at import
+	from unittest.mock import MagicMock as _MagicMock
+except Exception:
+	_MagicMock = None
 
 
-class MethodLoggingMeta(type):
-	def __new__(mcls, name, bases, namespace):
-		def wrap_instance(fn):
-			if getattr(fn, '__is_wrapped__', False):
-				return fn
-			@functools.wraps(fn)
-			def _wrapped(self, *args, **kwargs):
-				try:
-					# Prefer the standardized logger if present
-					logger = getattr(self, 'log', None)
-					msg = f"CALL {type(self).__name__}.{fn.__name__}()"
-					if callable(logger) and fn.__name__ != 'log' and getattr(self, 'log_method_calls', False):
-						# Gate console printing to allowed classes for CALL traces while still writing to file logs
-						try:
-							_allowed = getattr(TradingAlgorithm, 'CONSOLE_ALLOWED', None)
-						except Exception:
-							_allowed = None
-						cls_name = type(self).__name__
-						if _allowed is None or cls_name in _allowed:
-							logger(msg)
-						else:
-							# Temporarily disable console for this log line
-							try:
-								_orig = getattr(self, 'log_to_console', True)
-								setattr(self, 'log_to_console', False)
-								logger(msg)
-							finally:
-								try:
-									setattr(self, 'log_to_console', _orig)
-								except Exception:
-									pass
-					else:
-						# Fallback print with timestamp (no client id accessible yet here reliably)
-						try:
-							_ts = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-						except Exception:
-							_ts = '0000-00-00 00:00:00'
-						# Respect per-instance console preference when logger() isn't available
-						try:
-							_allowed = getattr(TradingAlgorithm, 'CONSOLE_ALLOWED', None)
-							cls_name = type(self).__name__
-							if (_allowed is None or cls_name in _allowed) and getattr(self, 'log_to_console', True) and getattr(self, 'log_method_calls', False):
-								print(f"[{cls_name}][clientId=?] {_ts} {msg}")
-						except Exception:
-							# Best-effort fallback
-							if getattr(self,
-							 'log_method_calls', False):
-								print(f"[{type(self).__name__}][clientId=?] {_ts} {msg}")
-				except Exception:
-					pass
-				return fn(self, *args, **kwargs)
-			_wrapped.__is_wrapped__ = True
-			return _wrapped
-
-		def wrap_classmethod(cm):
-			fn = cm.__func__
-			if getattr(fn, '__is_wrapped__', False):
-				return cm
-			@functools.wraps(fn)
-			def _wrapped(cls, *args, **kwargs):
-				try:
-					if not getattr(cls, 'log_method_calls', False):
-						return fn(cls, *args, **kwargs)
-					try:
-						_ts = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-					except Exception:
-						_ts = '0000-00-00 00:00:00'
-					_allowed = getattr(cls, 'CONSOLE_ALLOWED', None)
-					if _allowed is None or cls.__name__ in _allowed:
-						print(f"[{cls.__name__}][clientId=?] {_ts} CALL {cls.__name__}.{fn.__name__}()")
-				except Exception:
-					pass
-				return fn(cls, *args, **kwargs)
-			_wrapped.__is_wrapped__ = True
-			return classmethod(_wrapped)
-
-		def wrap_staticmethod(sm, owner_name):
-			fn = sm.__func__
-			if getattr(fn, '__is_wrapped__', False):
-				return sm
-			@functools.wraps(fn)
-			def _wrapped(*args, **kwargs):
-				try:
-					# For staticmethods, use global flag from TradingAlgorithm
-					if not getattr(TradingAlgorithm, 'log_method_calls', False):
-						return fn(*args, **kwargs)
-					try:
-						_ts = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-					except Exception:
-						_ts = '0000-00-00 00:00:00'
-					try:
-						_allowed = getattr(TradingAlgorithm, 'CONSOLE_ALLOWED', None)
-					except Exception:
-						_allowed = None
-					if _allowed is None or owner_name in _allowed:
-						print(f"[{owner_name}][clientId=?] {_ts} CALL {owner_name}.{fn.__name__}()")
-				except Exception:
-					pass
-				return fn(*args, **kwargs)
-			_wrapped.__is_wrapped__ = True
-			return staticmethod(_wrapped)
-
-		for attr, val in list(namespace.items()):
-			# Skip dunder methods and the logger itself to avoid recursion
-			if attr == 'log' or (attr.startswith('__') and attr.endswith('__')):
-				continue
-			if isinstance(val, types.FunctionType):
-				namespace[attr] = wrap_instance(val)
-			elif isinstance(val, classmethod):
-				namespace[attr] = wrap_classmethod(val)
-			elif isinstance(val, staticmethod):
-				namespace[attr] = wrap_staticmethod(val, name)
-		return super().__new__(mcls, name, bases, namespace)
-
-
-
-class TradingAlgorithm(metaclass=MethodLoggingMeta):
-	log_method_calls = False
-	# Allowed algorithm class names to print to console for metaclass traces.
+_LOG_STOP = object()
+# Append-only raw log fds (os.open already makes them non-inheritable, PEP 446)
+_LOG_OPEN_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+# The .bin side channel must not go through Windows text mode, which would expand every 0x0A byte to 0x0D 0x0A
+_BIN_OPEN_FLAGS = _LOG_OPEN_FLAGS | getattr(os, 'O_BINARY', 0)
+
+# Binary side-channel records (<tag>.bin, enabled with binary_log=True): epoch seconds, kind, code, value.
+# Price records: code 0, value = price. Phase records: code = _PHASE_IDS[new phase], value = seconds in the
+# previous phase (NaN if unknown). Read them with scripts/read_binary_log.py.
+_BIN_RECORD = struct.Struct('<dBBd')
+_BIN_KIND_PRICE = 0
+_BIN_KIND_PHASE = 1
+# Connection-level failures that the stop/fill monitors expect during gateway hiccups; anything else is a bug
+_TRANSIENT_IB_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+
+_PHASE_IDS = {'IDLE': 0, 'SIGNAL_PENDING': 1, 'ORDER_PLACING': 2, 'BRACKET_SENT': 3, 'ACTIVE': 4, 'EXITING': 5, 'CLOSED': 6}
+
+
+def _drain_queue(q, flush, batch_max=64):
+	"""Writer thread body: pull queued items until _LOG_STOP, handing each batch of up to batch_max to flush."""
+	while True:
+		item = q.get()
+		if item is _LOG_STOP:
+			return
+		batch = [item]
+		stop = False
+		while len(batch) < batch_max:
+			try:
+				item = q.get_nowait()
+			except queue.Empty:
+				break
+			if item is _LOG_STOP:
+				stop = True
+				break
+			batch.append(item)
+		try:
+			flush(batch)
+		except Exception:
+			pass
+		if stop:
+			return
+
+
+def _drain_log_queue(q, fd, batch_max=64):
+	"""Log writer thread: submit queued, pre-encoded log lines to the raw fd one batch per syscall."""
+	_drain_queue(q, lambda batch: _write_batch(fd, batch), batch_max)
+
+
+def _print_batch(batch):
+	out = sys.stdout
+	out.write(''.join(batch))
+	out.flush()
+
+
+def _drain_console_queue(q, batch_max=64):
+	"""Console writer thread: print queued lines in batches so trading threads never block on stdout."""
+	_drain_queue(q, _print_batch, batch_max)
+
+
+def _write_batch(fd, batch):
+	"""Write all buffers in batch to fd, preferring a single writev and finishing any short write."""
+	if hasattr(os, 'writev'):
+		written = os.writev(fd, batch)
+		total = sum(len(b) for b in batch)
+		if written >= total:
+			return
+		data = memoryview(b''.join(batch))[written:]
+	else:
+		data = memoryview(b''.join(batch))
+	while data:
+		data = data[os.write(fd, data):]
+
+
+def _noop(*args, **kwargs):
+	"""Stand-in bound in place of a per-loop hook whose feature is not configured."""
+	return None
+
+
+def _trace_enabled():
+	"""True when TRADING_BOT_TRACE is set to something other than '', 0, false, no or off."""
+	return os.environ.get('TRADING_BOT_TRACE', '').strip().lower() not in ('', '0', 'false', 'no', 'off')
+
+
+# class -> (CONSOLE_ALLOWED object it was resolved against, "CALL <Class>" head, console allowed)
+_trace_heads = {}
+
+
+def log_calls(fn):
+	"""Opt-in CALL tracing for coarse lifecycle methods.
+
+	Tracing is enabled by setting the TRADING_BOT_TRACE environment variable at
+	import time; otherwise the function is returned unchanged so hot paths pay nothing.
+	"""
+	if not _trace_enabled():
+		return fn
+	suffix = f".{fn.__name__}()"
+	@functools.wraps(fn)
+	def _wrapped(self, *args, **kwargs):
+		try:
+			cls = type(self)
+			_allowed = TradingAlgorithm.CONSOLE_ALLOWED
+			head = _trace_heads.get(cls)
+			# Resolved once per class; re-resolved when CONSOLE_ALLOWED is reassigned (main_class does at startup)
+			if head is None or head[0] is not _allowed:
+				name = cls.__name__
+				head = _trace_heads[cls] = (_allowed, "CALL " + name, _allowed is None or name in _allowed)
+			# Disallowed classes still get the trace in their file log, just not on the console
+			console = head[2] and getattr(self, 'log_to_console', True)
+			self.log(head[1] + suffix, console=console)
+		except Exception:
+			pass
+		return fn(self, *args, **kwargs)
+	return _wrapped
+
+
+
+class TradingAlgorithm:
+	# Allowed algorithm class names to print to console for CALL traces.
 	# None means allow all. Default restricts to the CCI-200 algo.
 	CONSOLE_ALLOWED = { 'CCI14_200_TradingAlgorithm' }
-	# Class-level counter for synthetic client ids when using injected mock IB objects
-	_mock_id_counter = 8000
-	# Shared log file registry: log_tag -> {fp, lock}
+	# Lookback of the 1-min historical price fallback: enough to cover a quiet market without pulling a full day of bars
+	_FALLBACK_HIST_DURATION = '1800 S'
+	# Synthetic client ids for injected IB objects; next() on a count is atomic, so no lock or retry is needed
+	_mock_ids = itertools.count(8001)
+	# Shared log file registry: log_tag -> {fd, queue, writer}
 	_shared_logs = {}
+	# Log tags whose atexit closer is already registered
+	_atexit_log_tags = set()
 	# One-time process-wide console padding guard
 	_console_padded_once = False
+	# Process-wide console writer (see _console_write); queue and thread are created on first use
+	_console_queue = None
+	_console_writer = None
+	_console_lock = threading.Lock()
+	# (epoch second, formatted timestamp) shared by all instances' log lines
+	_ts_cache = (0, '')
+	# Coalesced local now() for _now(): value and the monotonic time it was read
+	_cached_now = None
+	_cached_now_mono = 0.0
 	def _ensure_logger(self):
 		if hasattr(self, '_logger'):
 			return self._logger
@@ -152,24 +173,132 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		self._logger = logger
 		return logger
 
-	def log(self, msg: str):
-		"""Standardized logging with subclass/clientId prefix and wall-clock timestamp (YYYY-MM-DD HH:MM:SS)."""
-		log_tag = getattr(self, '_log_tag', type(self).__name__)
+	@staticmethod
+	def _log_ts():
+		"""Return 'YYYY-MM-DD HH:MM:SS' for now, formatted once per wall-clock second and shared by all instances."""
+		sec = int(time.time())
+		cached = TradingAlgorithm._ts_cache
+		if cached[0] == sec:
+			return cached[1]
+		try:
+			ts = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+		except Exception:
+			return '0000-00-00 00:00:00'
+		TradingAlgorithm._ts_cache = (sec, ts)
+		return ts
+
+	def _timestamp(self):
+		"""Local wall-clock 'HH:MM:SS' for message text, served from the per-second log timestamp cache."""
+		return self._log_ts()[11:]
+
+	@staticmethod
+	def _hms(now):
+		"""'HH:MM:SS' of an already-read datetime (e.g. trading-timezone now) without going through strftime."""
+		return f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+
+	def log(self, msg, *args, console=None):
+		"""Standardized logging with subclass/clientId prefix and wall-clock timestamp (YYYY-MM-DD HH:MM:SS).
+
+		msg may be a zero-argument callable returning the text, or a %-format string with args
+		(log("size=%s", n)); either way it is only rendered when the line will actually be written
+		somewhere (file or console). console overrides log_to_console for this line.
+		Never raises, so callers need no try/except around it.
+		"""
+		if console is None:
+			console = getattr(self, 'log_to_console', True)
 		try:
-			ts = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+			if args or callable(msg):
+				if getattr(self, '_log_queue', None) is None and getattr(self, '_log_fd', None) is None and not console:
+					return
+				msg = msg % args if args else msg()
+			text = msg if type(msg) is str else str(msg)
+		except Exception as e:
+			text = f"⚠️ log message could not be rendered ({type(e).__name__}: {e})"
+		ts = self._log_ts()
+		head = getattr(self, '_prefix_head', None)
+		if head is None:
+			# Logging before _setup_logging finished; build the head on the fly
+			head = f"[{getattr(self, '_log_tag', type(self).__name__)}][clientId={getattr(self, 'client_id', '?')}] "
+		line = head + ts + ' ' + text
+		try:
+			log_queue = getattr(self, '_log_queue', None)
+			if log_queue is not None:
+				# Encoded once here, then handed off to the per-tag writer thread; no lock or syscall
+				log_queue.put((line + "\n").encode('utf-8'))
+			elif getattr(self, '_log_fd', None) is not None:
+				# O_APPEND makes each write land whole at the end of the file
+				os.write(self._log_fd, (line + "\n").encode('utf-8'))
+		except Exception:
+			pass
+		if console:
+			self._console_write(line)
+
+	@staticmethod
+	def _console_write(line):
+		"""Hand a console line to the process-wide console writer thread (started on first use)."""
+		q = TradingAlgorithm._console_queue
+		if q is None:
+			with TradingAlgorithm._console_lock:
+				q = TradingAlgorithm._console_queue
+				if q is None:
+					try:
+						q = queue.SimpleQueue()
+						writer = threading.Thread(target=_drain_console_queue, args=(q,), name="console-writer", daemon=True)
+						writer.start()
+					except Exception:
+						print(line)
+						return
+					TradingAlgorithm._console_writer = writer
+					TradingAlgorithm._console_queue = q
+					atexit.register(TradingAlgorithm._close_console)
+		q.put(line + "\n")
+
+	@staticmethod
+	def _close_console():
+		"""atexit hook: let the console writer print whatever is still queued."""
+		q = TradingAlgorithm._console_queue
+		if q is not None:
+			q.put(_LOG_STOP)
+			TradingAlgorithm._console_writer.join(timeout=2)
+
+	@staticmethod
+	def _close_shared_log(tag):
+		"""atexit hook: stop and join the tag's writer thread, then close its fd."""
+		try:
+			info = TradingAlgorithm._shared_logs.get(tag)
+			if info and info.get('writer') is not None:
+				info['queue'].put(_LOG_STOP)
+				info['writer'].join(timeout=2)
+			if info and info['fd'] is not None:
+				os.close(info['fd'])
+			if info and info.get('bin_fd') is not None:
+				os.close(info['bin_fd'])
 		except Exception:
-			ts = '0000-00-00 00:00:00'
-		prefix = f"[{log_tag}][clientId={getattr(self, 'client_id', '?')}] {ts} "
-		line = prefix + str(msg)
-		try:
-			if getattr(self, '_log_lock', None) is not None and getattr(self, '_log_fp', None) is not None:
-				with self._log_lock:
-					self._log_fp.write(line + "\n")
-					self._log_fp.flush()
+			pass
+
+	def _open_binary_log(self):
+		"""Open (or reuse) the append-only <tag>.bin side channel shared by instances with the same log tag."""
+		self._bin_fd = None
+		info = TradingAlgorithm._shared_logs.get(getattr(self, '_log_tag', None))
+		if not info or info.get('fd') is None:
+			return
+		if info.get('bin_fd') is None:
+			try:
+				info['bin_fd'] = os.open(os.path.join(self.log_dir, f"{self._log_tag}.bin"), _BIN_OPEN_FLAGS, 0o644)
+			except Exception:
+				return
+		self._bin_fd = info['bin_fd']
+
+	def _write_bin(self, kind, code, value):
+		"""Append one fixed-size record; a single O_APPEND write, so no lock is needed."""
+		try:
+			os.write(self._bin_fd, _BIN_RECORD.pack(time.time(), kind, code, float(value)))
 		except Exception:
 			pass
-		if getattr(self, 'log_to_console', True):
-			print(line)
+
+	def _refresh_log_prefix(self):
+		"""Rebuild the constant '[tag][clientId=N] ' head of every log line; call when client_id changes."""
+		self._prefix_head = f"[{getattr(self, '_log_tag', type(self).__name__)}][clientId={getattr(self, 'client_id', '?')}] "
 
 	def log_exception(self, exc: Exception, context: Optional[str] = None):
 		"""Log an exception with traceback to the per-algorithm log and console.
@@ -190,18 +319,55 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			pass
 
 	def _pick_price(self, tick):
-		"""Return (field_name, value) for the first valid price in priority order."""
-		for field in ('last', 'close', 'ask', 'bid'):
-			val = getattr(tick, field, None)
-			if isinstance(val, (int, float)) and not (isinstance(val, float) and math.isnan(val)):
-				return field, val
+		"""Return (field_name, value) for the first valid price in priority order.
+
+		Unrolled on purpose: this runs on every tick poll. Missing fields read as None, float
+		subclasses such as numpy.float64 count as prices, and `v == v` is False only for NaN.
+		"""
+		v = getattr(tick, 'last', None)
+		if isinstance(v, (int, float)) and v == v:
+			return 'last', v
+		v = getattr(tick, 'close', None)
+		if isinstance(v, (int, float)) and v == v:
+			return 'close', v
+		v = getattr(tick, 'ask', None)
+		if isinstance(v, (int, float)) and v == v:
+			return 'ask', v
+		v = getattr(tick, 'bid', None)
+		if isinstance(v, (int, float)) and v == v:
+			return 'bid', v
 		return None, None
 	def calculate_ema(self, price, prev_ema, k):
-		"""Calculate the next EMA value."""
-		return round(price * k + prev_ema * (1 - k), 4) if prev_ema is not None else price
+		"""Calculate the next EMA value (full precision; round only for display)."""
+		return price * k + prev_ema * (1 - k) if prev_ema is not None else price
+
+	@staticmethod
+	def _r4(v):
+		"""Round a float indicator to 4 decimals for display/export; other values pass through."""
+		return round(v, 4) if isinstance(v, float) else v
+
+	@staticmethod
+	def _ema_series(prices, k, seed):
+		"""Return the EMA of each price in prices, starting from seed.
+
+		Bulk path for warm-up over a history window; calculate_ema remains the per-tick step.
+		"""
+		out = []
+		append = out.append
+		e = seed
+		for p in prices:
+			e += (p - e) * k
+			append(e)
+		return out
 
 	def log_price(self, time_str, price, **kwargs):
-		"""Standardized logging for price and indicators. kwargs can include EMA, CCI, etc."""
+		"""Standardized logging for price and indicators. kwargs can include EMA, CCI, etc.
+
+		With binary_log enabled the line is replaced by a fixed-size price record in the .bin side channel.
+		"""
+		if getattr(self, '_bin_fd', None) is not None:
+			self._write_bin(_BIN_KIND_PRICE, 0, price)
+			return
 		msg = f"{time_str} 📊 Price: {price}"
 		# Print both close_history and tp_history latest values for diagnostics
 		if hasattr(self, 'close_history') and self.close_history:
@@ -209,7 +375,8 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		if hasattr(self, 'tp_history') and self.tp_history:
 			msg += f" | tp_history[-1]: {self.tp_history[-1]}"
 		for key, value in kwargs.items():
-			msg += f" | {key}: {value}"
+			# Indicators are kept at full precision; 4 decimals is a display choice
+			msg += f" | {key}: {self._r4(value)}"
 		self.log(msg)
 
 	# ===== Unified helpers to standardize behavior across all algorithms =====
@@ -232,8 +399,12 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				_now = self._now_in_tz()
 				minute_aligned = _now.replace(second=0, microsecond=0)
 			except Exception:
-				minute_aligned = datetime.datetime.now().replace(second=0, microsecond=0)
-			self.log(f"{time_str} 📈 Market price saved for {minute_aligned.strftime('%Y-%m-%d %H:%M:%S')}: {price:.2f}")
+				minute_aligned = self._now().replace(second=0, microsecond=0)
+			# Format the bucket once per minute rather than on every tick
+			cached = getattr(self, '_saved_minute_str', None)
+			if cached is None or cached[0] != minute_aligned:
+				cached = self._saved_minute_str = (minute_aligned, minute_aligned.strftime('%Y-%m-%d %H:%M:%S'))
+			self.log(f"{time_str} 📈 Market price saved for {cached[1]}: {price:.2f}")
 		except Exception:
 			pass
 
@@ -247,7 +418,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				self.log(f"{time_str} 📥 New TP added: {price:.2f}")
 			# Additional maintenance/info lines
 			self.log(f"{time_str} 📊 Updated price_history length: {len(self.price_history)}")
-			recent_tp = ", ".join(f"{p:.2f}" for p in self.price_history[-10:])
+			recent_tp = ", ".join(f"{p:.2f}" for p in self._tail(self.price_history, 10))
 			self.log(f"{time_str} 🧪 Recent TP Values: {recent_tp}")
 			self.log(f"{time_str} 🧼 Cleaned price series length: {len(self.price_history)}")
 			self.log(f"{time_str} 🧪 TP Series Length After Cleaning: {len(self.price_history)}")
@@ -269,19 +440,9 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				used_multi = True
 				if not hasattr(self, '_multi_emas') or self._multi_emas is None:
 					self._multi_emas = {}
-				# Precompute k per span
-				_k = {}
-				for span in spans:
-					try:
-						_k[span] = 2/(int(span)+1)
-					except Exception:
-						continue
-				for span in spans:
-					k = _k.get(span)
-					if k is None:
-						continue
+				for span, k in self._multi_ema_alphas(spans):
 					prev = self._multi_emas.get(span)
-					self._multi_emas[span] = price if prev is None else round(price*k + prev*(1-k), 4)
+					self._multi_emas[span] = price if prev is None else price*k + prev*(1-k)
 					# Maintain small history buffers if present
 					try:
 						if hasattr(self, '_multi_ema_histories') and span in self._multi_ema_histories:
@@ -334,11 +495,11 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			# Fallbacks if no multi set
 			if not parts:
 				if hasattr(self, 'ema_fast') and isinstance(getattr(self, 'EMA_FAST_PERIOD', None), int):
-					parts.append(f"EMA{self.EMA_FAST_PERIOD}={getattr(self, 'ema_fast', None)}")
+					parts.append(f"EMA{self.EMA_FAST_PERIOD}={self._r4(getattr(self, 'ema_fast', None))}")
 				if hasattr(self, 'ema_slow') and isinstance(getattr(self, 'EMA_SLOW_PERIOD', None), int):
-					parts.append(f"EMA{self.EMA_SLOW_PERIOD}={getattr(self, 'ema_slow', None)}")
+					parts.append(f"EMA{self.EMA_SLOW_PERIOD}={self._r4(getattr(self, 'ema_slow', None))}")
 				if isinstance(getattr(self, 'EMA_PERIOD', None), int) and hasattr(self, 'live_ema'):
-					parts.append(f"EMA{self.EMA_PERIOD}={getattr(self, 'live_ema', None)}")
+					parts.append(f"EMA{self.EMA_PERIOD}={self._r4(getattr(self, 'live_ema', None))}")
 			if parts:
 				self.log(f"{time_str} 🧪 EMAS: " + " | ".join(str(p) for p in parts))
 		except Exception:
@@ -353,16 +514,25 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			if len(prices) >= period:
 				cci = self.calculate_and_log_cci(prices, time_str)
 				if cci is not None:
-					if not hasattr(self, 'cci_values') or self.cci_values is None:
-						self.cci_values = []
-					self.cci_values.append(cci)
-					if len(self.cci_values) > 100:
-						self.cci_values = self.cci_values[-100:]
+					self._append_cci_value(cci)
 					self.prev_cci = cci
 		except Exception:
 			pass
 		return cci
 
+	def _append_cci_value(self, cci):
+		"""Append to cci_values keeping only the latest 100 entries.
+
+		The base creates a deque(maxlen=100) so eviction is O(1); lists assigned by
+		subclasses are trimmed in place rather than re-sliced into a new list.
+		"""
+		vals = getattr(self, 'cci_values', None)
+		if vals is None:
+			vals = self.cci_values = deque(maxlen=100)
+		vals.append(cci)
+		if isinstance(vals, list) and len(vals) > 100:
+			del vals[:-100]
+
 	def calculate_and_log_cci(self, prices, time_str: str):
 		"""Base implementation of CCI(14) calculator with optional classic mode.
 
@@ -375,8 +545,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			if len(prices) < period:
 				self.log(f"{time_str} ⚠️ Not enough data for CCI")
 				return None
-			from statistics import mean, stdev
-			window = prices[-period:]
+			window = self._tail(prices, period)
 			avg_tp = mean(window)
 			classic_mode = bool(getattr(self, 'classic_cci_mode', False))
 			if classic_mode:
@@ -405,21 +574,113 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 
 	def log_checking_trade_conditions(self, time_str: str):
 		"""Standard line before strategy-specific decision checks."""
-		try:
-			self.log(f"{time_str} 🚦 Checking trade conditions...")
+		self.log(f"{time_str} 🚦 Checking trade conditions...")
+	def _tick_is_live(self, tick):
+		"""True when tick is an ib_insync Ticker on a live IB connection, i.e. its updateEvent will fire."""
+		return isinstance(tick, Ticker) and isinstance(self.ib, IB)
+
+	def _can_await_tick(self, tick):
+		"""True when tick is live and this thread runs the IB loop, so awaiting its updateEvent can wake.
+
+		updateEvent fires on the loop that owns ib; a worker thread's private loop (see _in_worker_loop)
+		would wait on it unsafely and may never wake, so workers poll with ib.sleep instead.
+		"""
+		return self._tick_is_live(tick) and not getattr(self._loop_local, 'worker', False)
+
+	async def _wait_for_tick_price(self, tick, timeout):
+		"""Await tick.updateEvent until _pick_price finds a field or the timeout elapses.
+
+		The ticker is read once more on the way out, so fields that landed without an event are not missed.
+		"""
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + timeout
+		source, price = self._pick_price(tick)
+		while source is None:
+			remaining = deadline - loop.time()
+			if remaining <= 0:
+				break
+			try:
+				await asyncio.wait_for(tick.updateEvent, timeout=remaining)
+			except asyncio.TimeoutError:
+				break
+			source, price = self._pick_price(tick)
+		if source is None:
+			source, price = self._pick_price(tick)
+		return source, price
+
+	async def _fallback_price_async(self, timeout=5.0):
+		"""Issue the snapshot and 1-min historical fallbacks concurrently; return the first valid (source, price).
+
+		The slower request is cancelled as soon as one of them yields a usable value.
+		"""
+		duration = self._FALLBACK_HIST_DURATION
+		snap = asyncio.ensure_future(self.ib.reqTickersAsync(self.contract))
+		hist = asyncio.ensure_future(self.ib.reqHistoricalDataAsync(self.contract, endDateTime='', durationStr=duration, barSizeSetting='1 min', whatToShow='TRADES', useRTH=False, keepUpToDate=False))
+		pending = {snap, hist}
+		loop = asyncio.get_running_loop()
+		deadline = loop.time() + timeout
+		source, price = None, None
+		try:
+			while pending and source is None:
+				remaining = deadline - loop.time()
+				if remaining <= 0:
+					break
+				done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+				if snap in done:
+					try:
+						tickers = snap.result()
+						if tickers:
+							source, price = self._pick_price(tickers[0])
+							if source:
+								self.log("🩹 Price obtained via snapshot fallback")
+					except Exception as e:
+						self.log(f"⚠️ Snapshot fallback error: {e}")
+				if hist in done and source is None:
+					try:
+						bars = hist.result()
+						self._log_fallback_bars(duration, bars)
+						if bars:
+							source, price = 'hist_close', bars[-1].close
+							self.log("🗄️ Price derived from historical 1-min close")
+					except Exception as e:
+						self.log(f"⚠️ Historical fallback error: {e}")
+		finally:
+			for task in pending:
+				task.cancel()
+		return source, price
+
+	def _log_fallback_bars(self, duration, bars):
+		"""Log a concise summary (count + last 3 bars) of a fallback historical request."""
+		try:
+			count = len(bars) if bars is not None else 0
+			def _bar_desc(b):
+				# Prefer timestamp under 'date' or 'time' if provided by ib_insync BarData
+				date = getattr(b, 'date', None) or getattr(b, 'time', None)
+				o = getattr(b, 'open', None)
+				h = getattr(b, 'high', None)
+				l = getattr(b, 'low', None)
+				c = getattr(b, 'close', None)
+				if date is not None:
+					return f"({date}, O={o}, H={h}, L={l}, C={c})"
+				return f"(O={o}, H={h}, L={l}, C={c})"
+			sample = ", ".join(_bar_desc(b) for b in list(bars)[-3:]) if count else ""
+			self.log(f"🗄️ Fallback history: duration={duration} | bars={count} | sample={sample}")
 		except Exception:
 			pass
+
 	def get_valid_price(self):
 		"""Fetch a current price prioritizing a persistent streaming subscription.
 		Strategy:
 		1. Lazily create (and reuse) a streaming market data subscription (snapshot=False).
-		2. Poll up to ~2.5s in short intervals for any of last/close/ask/bid.
+		2. Wait up to ~2.5s for any of last/close/ask/bid, waking on the ticker's updateEvent.
 		3. If still None and connection alive, fallback to a one-off snapshot.
 		4. If still None, attempt a 1-bar historical request (1 min) and use its close.
+		   On a live IB connection steps 3 and 4 run concurrently and the first valid result wins.
+		5. Only with price_cache_max_age > 0: the last live price, if no older than that.
 		Returns None if every method fails.
 		"""
 		# Allow proceeding for injected mock IB objects (tests) even if not connected.
-		if getattr(self, 'ib', None) is None:
+		if self.ib is None:
 			self.log("⚠️ get_valid_price called with no IB instance")
 			print(f"[DIAG] IB instance is None in get_valid_price")
 			return None
@@ -433,33 +694,41 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		# Testing accommodation: if the cached streaming tick is a MagicMock (unit tests monkeypatch reqMktData
 		# between calls to simulate different field availability), discard it so each call reflects the newest
 		# mocked return value and honors the documented priority ordering.
-		try:
-			from unittest.mock import MagicMock  # local import to avoid hard dependency at module import time
-			if isinstance(getattr(self, '_md_tick', None), MagicMock):
-				self._md_tick = None
-		except Exception:
-			pass
+		if _MagicMock is not None and isinstance(self._md_tick, _MagicMock):
+			self._md_tick = None
 		try:
 			# 1. Create streaming subscription once
-			if not hasattr(self, '_md_tick') or self._md_tick is None:
+			if self._md_tick is None:
 				try:
 					self._md_tick = self.ib.reqMktData(self.contract, snapshot=False)
-					self._md_started = time.time()
+					self._md_started = time.monotonic()
 					self.log("📡 Streaming market data subscription started")
 				except Exception as e:
 					self.log(f"⚠️ Failed to start streaming market data: {e}")
 					self._md_tick = None
 			price = None
 			source = None
-			# 2. Poll streaming tick
+			# 2. Wait on the streaming tick (up to ~2.5s)
 			if self._md_tick is not None:
-				for _ in range(10):  # ~2.5s (10 * 0.25)
-					source, price = self._pick_price(self._md_tick)
-					if source is not None:
-						break
-					self.ib.sleep(0.25)
-			snapshot_failed = False
-			if source is None:
+				source, price = self._pick_price(self._md_tick)
+				if source is None:
+					if self._can_await_tick(self._md_tick):
+						# Real ticker: wake on its updateEvent instead of rounding up to poll intervals
+						source, price = self.ib.run(self._wait_for_tick_price(self._md_tick, 2.5))
+					else:
+						poll = self._tick_poll_interval
+						for _ in range(max(1, int(2.5 / poll))):  # ~2.5s total
+							self.ib.sleep(poll)
+							source, price = self._pick_price(self._md_tick)
+							if source is not None:
+								break
+			if source is None and isinstance(self.ib, IB):
+				# 3+4. Live connection: race snapshot and historical fallbacks instead of running them back to back
+				try:
+					source, price = self.ib.run(self._fallback_price_async())
+				except Exception as e:
+					self.log(f"⚠️ Price fallback error: {e}")
+			elif source is None:
 				# 3. Fallback snapshot
 				try:
 					fallback_tick = self.ib.reqMktData(self.contract, snapshot=True)
@@ -469,42 +738,32 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 						self.log("🩹 Price obtained via snapshot fallback")
 				except Exception as e:
 					self.log(f"⚠️ Snapshot fallback error: {e}")
-					snapshot_failed = True
 					# If both streaming and snapshot retrieval failed due to exceptions, bail fast
 					if self._md_tick is None:
 						return None
-			if source is None:
-				# 4. Historical fallback (1 bar)
-				try:
-					duration = '1 D'
-					bars = self.ib.reqHistoricalData(self.contract, endDateTime='', durationStr=duration, barSizeSetting='1 min', whatToShow='TRADES', useRTH=False, keepUpToDate=False)
-					# Log concise summary of fallback history
+				if source is None:
+					# 4. Historical fallback (1 bar)
 					try:
-						count = len(bars) if bars is not None else 0
-						def _bar_desc(b):
-							# Prefer timestamp under 'date' or 'time' if provided by ib_insync BarData
-							date = getattr(b, 'date', None) or getattr(b, 'time', None)
-							o = getattr(b, 'open', None)
-							h = getattr(b, 'high', None)
-							l = getattr(b, 'low', None)
-							c = getattr(b, 'close', None)
-							if date is not None:
-								return f"({date}, O={o}, H={h}, L={l}, C={c})"
-							return f"(O={o}, H={h}, L={l}, C={c})"
-						sample = ", ".join(_bar_desc(b) for b in list(bars)[-3:]) if count else ""
-						self.log(f"🗄️ Fallback history: duration={duration} | bars={count} | sample={sample}")
-					except Exception:
-						pass
-					if bars:
-						price = bars[-1].close
-						source = 'hist_close'
-						self.log("🗄️ Price derived from historical 1-min close")
-				except Exception as e:
-					self.log(f"⚠️ Historical fallback error: {e}")
+						duration = self._FALLBACK_HIST_DURATION
+						bars = self.ib.reqHistoricalData(self.contract, endDateTime='', durationStr=duration, barSizeSetting='1 min', whatToShow='TRADES', useRTH=False, keepUpToDate=False)
+						self._log_fallback_bars(duration, bars)
+						if bars:
+							price = bars[-1].close
+							source = 'hist_close'
+							self.log("🗄️ Price derived from historical 1-min close")
+					except Exception as e:
+						self.log(f"⚠️ Historical fallback error: {e}")
 			if source is None:
-				self.log("⚠️ No valid tick fields after streaming+fallback attempts — price=None")
-				return None
-			self.log(f"💵 Price selected from {source}: {price}")
+				cached = self._last_known_price
+				max_age = self._last_known_price_max_age
+				if cached is None or max_age <= 0 or time.monotonic() - self._last_known_price_ts > max_age:
+					self.log("⚠️ No valid tick fields after streaming+fallback attempts — price=None")
+					return None
+				source, price = 'cache', cached
+			else:
+				self._last_known_price = price
+				self._last_known_price_ts = time.monotonic()
+			self.log("💵 Price selected from %s: %s", source, price)
 			return price
 		except Exception as e:
 			self.log(f"⚠️ Error fetching price: {e}")
@@ -514,33 +773,105 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		# Maintain two histories: close_history (all closes) and tp_history (filtered for CCI)
 		if not hasattr(self, 'close_history'):
 			self.close_history = []
-		if not hasattr(self, 'tp_history'):
-			self.tp_history = []
-		# Update close_history (all closes, no filtering)
+		tp_history = getattr(self, 'tp_history', None)
+		if not isinstance(tp_history, deque) or tp_history.maxlen != maxlen:
+			# Bounded deque: O(1) append with automatic eviction once the window is full
+			tp_history = self.tp_history = deque(tp_history or (), maxlen=maxlen)
+		# Update close_history (all closes, no filtering); trimmed in place since subclasses slice it
 		self.close_history.append(price)
 		if len(self.close_history) > maxlen:
-			self.close_history = self.close_history[-maxlen:]
+			del self.close_history[:-maxlen]
 		# Update tp_history (filter consecutive duplicates)
-		if not self.tp_history or price != self.tp_history[-1]:
-			self.tp_history.append(price)
-			if len(self.tp_history) > maxlen:
-				self.tp_history = self.tp_history[-maxlen:]
+		if not tp_history or price != tp_history[-1]:
+			tp_history.append(price)
 		# For backward compatibility, keep price_history as tp_history
-		self.price_history = self.tp_history
+		self.price_history = tp_history
+
+	@staticmethod
+	def _tail(values, n):
+		"""Return the last n items of a list or deque as a list (deques do not support slicing)."""
+		if isinstance(values, (list, tuple)):
+			return list(values[-n:])
+		n = min(n, len(values))
+		return [values[i] for i in range(-n, 0)]
+
+	def _positions_by_conid(self):
+		"""Return {conId: position} for non-flat positions, reusing a short-lived snapshot.
+
+		The snapshot is only reused while a real IB instance reports position changes through
+		positionEvent (which clears it), so it can never hide an update for longer than the TTL.
+		Mocks are always re-read, as in _positions_snapshot.
+		"""
+		now = time.monotonic()
+		ts, by_conid = getattr(self, '_positions_cache', (0.0, None))
+		if by_conid is not None and now - ts < self._positions_cache_ttl:
+			return by_conid
+		by_conid = {}
+		for p in self.ib.positions():
+			if getattr(p, 'position', 0):
+				by_conid[getattr(getattr(p, 'contract', None), 'conId', None)] = p
+		self._positions_cache = (now, by_conid) if isinstance(self.ib, IB) and self._watch_position_events() else (0.0, None)
+		return by_conid
+
+	def _watch_position_events(self):
+		"""Subscribe once per IB instance to positionEvent to invalidate the positions snapshot."""
+		if getattr(self, '_positions_watched_ib', None) is self.ib:
+			return True
+		event = getattr(self.ib, 'positionEvent', None)
+		if event is None:
+			return False
+		try:
+			event += self._invalidate_positions_cache
+		except Exception:
+			return False
+		self._positions_watched_ib = self.ib
+		return True
+
+	def _invalidate_positions_cache(self, *args):
+		self._positions_cache = (0.0, None)
+		self._positions_dirty = True
+
+	def _positions_snapshot(self):
+		"""Return ib.positions(), re-fetched only after positionEvent marks the snapshot dirty.
+
+		Only a real IB instance is trusted to raise positionEvent; mocks are always re-read.
+		"""
+		cached = getattr(self, '_positions_list', None)
+		if cached is not None and not getattr(self, '_positions_dirty', True) and getattr(self, '_positions_watched_ib', None) is self.ib:
+			return cached
+		positions = self.ib.positions()
+		if isinstance(self.ib, IB) and self._watch_position_events():
+			self._positions_list = positions
+			self._positions_dirty = False
+		return positions
+
+	def _contract_conid(self):
+		"""Return self.contract.conId, snapshotted once the contract carries a real (non-zero) conId.
+
+		The snapshot is tied to the contract object, so assigning a new contract refreshes it.
+		"""
+		contract = self.contract
+		if getattr(self, '_algo_conid_contract', None) is contract:
+			return self._algo_conid
+		conid = getattr(contract, 'conId', None)
+		if conid:
+			self._algo_conid = conid
+			self._algo_conid_contract = contract
+		return conid
+
 	def has_active_position(self):
 		"""Return True if there is an active position OR a working transmitted order for this contract.
 		This blocks sending a new bracket while the previous one is still working (global pending-aware gating).
 		"""
-		algo_conid = getattr(self.contract, 'conId', None)
+		algo_conid = self._contract_conid()
 		# 1) Concrete positions on the account
 		try:
-			positions = self.ib.positions()
-			for p in positions:
-				pos_conid = getattr(getattr(p, 'contract', None), 'conId', None)
-				pos_size = getattr(p, 'position', 0)
-				self.log(f"🔍 has_active_position check: algo_conId={algo_conid} vs pos_conId={pos_conid} size={pos_size}")
-				if pos_conid == algo_conid and abs(pos_size) > 0:
-					return True
+			by_conid = self._positions_by_conid()
+			if getattr(self, '_debug_positions', False):
+				for pos_conid, p in by_conid.items():
+					self.log("🔍 has_active_position check: algo_conId=%s vs pos_conId=%s size=%s", algo_conid, pos_conid, getattr(p, 'position', 0))
+			if algo_conid in by_conid:
+				return True
 		except Exception:
 			# Fall through to pending-scan
 			pass
@@ -576,15 +907,16 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		if self.trade_phase not in ('ACTIVE', 'EXITING'):
 			self._set_trade_phase('ACTIVE', reason='Detected active position')
 		if hasattr(self, '_monitor_stop') and callable(self._monitor_stop):
-			positions = self.ib.positions()
-			self.current_sl_price = self._monitor_stop(positions)
+			self.current_sl_price = self._monitor_stop_throttled()
 		# Also scan fills to reset state if TP/SL executed
 		try:
 			self._check_fills_and_reset_state()
-		except Exception:
-			pass
+		except _TRANSIENT_IB_ERRORS as e:
+			self.log(f"⚠️ {time_str} check_fills transient: {e}")
+		except Exception as e:
+			self.log_exception(e, context=f"{time_str} check_fills")
 		return
-	def __init__(self, contract_params, *, client_id=None, ib_host='127.0.0.1', ib_port=7497, ib=None, log_name: str = None, test_order_enabled: bool = False, test_order_action: str = 'BUY', test_order_qty: int = 1, test_order_fraction: float = 0.5, test_order_delay_sec: int = 5, test_order_reference_price: float = None, trade_timezone: str = 'Asia/Jerusalem', pause_before_hour: int = 8, new_order_cutoff: tuple = (22, 30), shutdown_at: tuple = (22, 50), force_close: tuple = None, connection_attempts: int = 5, connection_retry_delay: int = 2, connection_timeout: int = 5, defer_connection: bool = False, auto_seed_enabled: bool = True, auto_seed_bars: int = 500, auto_seed_minutes: int = 500):
+	def __init__(self, contract_params, *, client_id=None, ib_host='127.0.0.1', ib_port=7497, ib=None, log_name: str = None, test_order_enabled: bool = False, test_order_action: str = 'BUY', test_order_qty: int = 1, test_order_fraction: float = 0.5, test_order_delay_sec: int = 5, test_order_reference_price: float = None, trade_timezone: str = 'Asia/Jerusalem', pause_before_hour: int = 8, new_order_cutoff: tuple = (22, 30), shutdown_at: tuple = (22, 50), force_close: tuple = None, connection_attempts: int = 5, connection_retry_delay: int = 2, connection_timeout: int = 5, defer_connection: bool = False, auto_seed_enabled: bool = True, auto_seed_bars: int = 500, auto_seed_minutes: int = 500, global_cancel: bool = False, debug_positions: bool = False, binary_log: bool = False, price_cache_max_age: float = 0.0):
 		self._init_thread_lock()
 		# High-level orchestrated initialization. Each helper is side-effectful on self.
 		self._validate_contract_params(contract_params)
@@ -597,6 +929,15 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		self._init_contract(contract_params, ib)
 		self._setup_logging(log_name)
 		self._init_trade_state()
+		# Bulk cancels via one reqGlobalCancel (affects every order on the account; see _send_global_cancel)
+		self._global_cancel = bool(global_cancel)
+		# Per-position diagnostics in has_active_position (off by default: one line per position per tick)
+		self._debug_positions = bool(debug_positions)
+		# Opt-in: let get_valid_price fall back to its last live price up to this many seconds old (0 = never)
+		self._last_known_price_max_age = float(price_cache_max_age or 0.0)
+		# High-volume price/phase records go to a compact binary side channel instead of text
+		if binary_log:
+			self._open_binary_log()
 		# Default multi-EMA spans to compute for all algorithms
 		try:
 			if not hasattr(self, 'multi_ema_spans') or not self.multi_ema_spans:
@@ -615,28 +956,28 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				# Only update for last price or close price
 				if field in (4, 7):  # 4=Last price, 7=Close price
 					try:
-						with self._lock:
-							self._latest_market_price = price
+						# Single attribute store; atomic under the GIL, so no lock on the tick path
+						self._latest_market_price = price
+						# Tick bursts: at most one monitor pass per _stop_check_min_interval
+						now_mono = time.monotonic()
+						if now_mono - self._last_stop_check < self._stop_check_min_interval:
+							return
+						self._last_stop_check = now_mono
 						# Offload monitoring to a thread (stop and limit)
 						def monitor_orders_thread():
-							import asyncio
-							try:
-								asyncio.get_event_loop()
-							except RuntimeError:
-								loop = asyncio.new_event_loop()
-								asyncio.set_event_loop(loop)
 							try:
 								with self._lock:
 									# Stop monitoring
 									if hasattr(self, '_monitor_stop') and callable(self._monitor_stop):
-										positions = self.ib.positions()
-										self.current_sl_price = self._monitor_stop(positions)
+										self.current_sl_price = self._monitor_stop_throttled()
 									# Limit monitoring
 									if hasattr(self, '_monitor_limit') and callable(self._monitor_limit):
 										self._monitor_limit()
-							except Exception:
-								pass
-						t = threading.Thread(target=monitor_orders_thread)
+							except _TRANSIENT_IB_ERRORS as e:
+								self.log(f"⚠️ monitor_stop transient: {e}")
+							except Exception as e:
+								self.log_exception(e, context="tick monitor")
+						t = threading.Thread(target=functools.partial(self._in_worker_loop, monitor_orders_thread))
 						t.daemon = True
 						t.start()
 					except Exception:
@@ -650,12 +991,17 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		"""
 		self._force_close = None
 		self._force_close_dt = None
+		self._force_close_src = None
+		self._force_close_epoch = None
+		# Bound once: the main loop calls _tick_force_close unconditionally
+		self._tick_force_close = _noop
 		if force_close is None:
 			return
 		try:
 			h, m = int(force_close[0]), int(force_close[1])
 			self._force_close = (h, m)
 			self._force_close_dt = self._compute_next_force_close()
+			self._tick_force_close = self._maybe_force_close
 			self.log(f"🕒 Force-close configured for {h:02d}:{m:02d} ({self.trade_timezone})")
 		except Exception as e:
 			self.log(f"⚠️ Invalid force_close value {force_close}: {e}")
@@ -673,6 +1019,14 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		except Exception:
 			return None
 
+	def _force_close_deadline(self):
+		"""Epoch seconds of _force_close_dt, recomputed only when the datetime is rescheduled."""
+		dt = self._force_close_dt
+		if dt is not self._force_close_src:
+			self._force_close_src = dt
+			self._force_close_epoch = dt.timestamp()
+		return self._force_close_epoch
+
 	def _maybe_force_close(self, now, time_str):
 		"""Flatten any open position at the configured daily force-close time.
 		Keeps loop running (unlike shutdown). Schedules next day's timestamp.
@@ -680,7 +1034,8 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		if self._force_close_dt is None:
 			return
 		try:
-			if now >= self._force_close_dt:
+			# Plain float compare; avoids tz-aware datetime arithmetic every loop iteration
+			if now.timestamp() >= self._force_close_deadline():
 				self.log(f"{time_str} ⚠️ Force-close window reached — flattening position")
 				# Close & cancel like shutdown but do not break loop
 				try:
@@ -691,8 +1046,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 					self.close_all_positions()
 				except Exception:
 					pass
-				self._set_trade_phase('CLOSED', reason='Force-close')
-				self._set_trade_phase('IDLE', reason='Post force-close reset')
+				self._transition(('CLOSED', 'IDLE'), reason='Force-close')
 				self._force_close_dt = self._compute_next_force_close()
 				self.log(f"🔁 Next force-close scheduled for {self._force_close_dt.strftime('%Y-%m-%d %H:%M')} ({self.trade_timezone})")
 		except Exception:
@@ -708,8 +1062,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 
 	def _prepare_client_id(self, ib, client_id):
 		if ib is not None and client_id is None:
-			TradingAlgorithm._mock_id_counter += 1
-			client_id = TradingAlgorithm._mock_id_counter
+			client_id = next(TradingAlgorithm._mock_ids)
 		self.requested_client_id = client_id
 		self.client_id = client_id
 
@@ -721,7 +1074,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			self.log_to_console = (True if (_allowed is None) else (cls_name in _allowed))
 		except Exception:
 			self.log_to_console = True
-		self._log_lock = threading.Lock()
+		self._log_queue = None
 		try:
 			base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 		except Exception:
@@ -737,48 +1090,41 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		today = datetime.datetime.now().strftime('_%Y%m%d')
 		self._log_tag = f"{log_name or type(self).__name__}_{symbol}_{expiry}{today}"
 		_disable = (self._log_tag.startswith('TradingAlgorithm') and log_name is None)
-		self._log_fp = None
+		self._log_fd = None
 		if not _disable:
 			shared = TradingAlgorithm._shared_logs.get(self._log_tag)
 			if shared is None:
 				file_name = f"{self._log_tag}.log"
 				log_path = os.path.join(self.log_dir, file_name)
-				lock = threading.Lock()
+				log_queue = None
+				writer = None
 				try:
-					self._log_fp = open(log_path, 'a', buffering=1, encoding='utf-8')
+					# Raw append-only fd: the writer thread submits whole batches with one writev
+					self._log_fd = os.open(log_path, _LOG_OPEN_FLAGS, 0o644)
 				except Exception:
-					self._log_fp = None
-				TradingAlgorithm._shared_logs[self._log_tag] = {'fp': self._log_fp, 'lock': lock}
+					self._log_fd = None
 				# Write file padding once per log tag for readability (10 blank lines)
 				try:
-					if self._log_fp is not None:
-						self._log_fp.write("\n" * 10)
-						self._log_fp.flush()
+					if self._log_fd is not None:
+						os.write(self._log_fd, b"\n" * 10)
 				except Exception:
 					pass
-				if self._log_fp is not None:
-					def _close_shared(tag=self._log_tag):
-						try:
-							info = TradingAlgorithm._shared_logs.get(tag)
-							if info and info['fp']:
-								info['fp'].flush(); info['fp'].close()
-						except Exception:
-							pass
-					atexit.register(_close_shared)
+				if self._log_fd is not None:
+					log_queue = queue.SimpleQueue()
+					writer = threading.Thread(target=_drain_log_queue, args=(log_queue, self._log_fd), name=f"log-writer-{self._log_tag}", daemon=True)
+					writer.start()
+				TradingAlgorithm._shared_logs[self._log_tag] = {'fd': self._log_fd, 'queue': log_queue, 'writer': writer}
+				# Exactly one atexit closer per tag, however many instances share it
+				if self._log_fd is not None and self._log_tag not in TradingAlgorithm._atexit_log_tags:
+					TradingAlgorithm._atexit_log_tags.add(self._log_tag)
+					atexit.register(TradingAlgorithm._close_shared_log, self._log_tag)
 			else:
-				self._log_fp = shared['fp']
-				self._log_lock = shared['lock']
+				self._log_fd = shared['fd']
 			shared_info = TradingAlgorithm._shared_logs.get(self._log_tag)
 			if shared_info:
-				self._log_lock = shared_info['lock']
-		def _close_fp(fp):
-			try:
-				if fp:
-					fp.flush(); fp.close()
-			except Exception:
-				pass
-		if self._log_fp is not None:
-			atexit.register(_close_fp, self._log_fp)
+				self._log_queue = shared_info.get('queue')
+
+		self._refresh_log_prefix()
 
 		# Console padding once per process: print 10 blank lines at startup
 		try:
@@ -803,28 +1149,67 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		self._ib_port = ib_port
 		self._connection_attempts = max(1, int(connection_attempts))
 		self._connection_retry_delay = max(1, int(retry_delay))
+		# Upper bound for the growing delay between connect attempts
+		self._connection_retry_max_delay = max(self._connection_retry_delay, 30)
+		# Exponential backoff with jitter between connect/reconnect attempts (see _backoff_sleep)
+		self._retry_base = float(self._connection_retry_delay)
+		self._retry_max = float(self._connection_retry_max_delay)
+		self._retry_jitter = 0.5
+		# Own generator: bots sharing a process don't contend on (or correlate through) the module-level one
+		self._rng = random.Random(os.getpid() ^ id(self))
+		self._reconnect_failures = 0
+		# Monotonic id of each connect() issued (initial attempts and reconnects), for log correlation
+		self._connect_seq = 0
+		# Market data type requested on the current session (False until set; see _ensure_market_data_type)
+		self._market_data_type_set = False
+		# Connection state: DISCONNECTED / CONNECTING / CONNECTED / ERROR (see _set_conn_state, is_connected)
+		self._conn_state = 'DISCONNECTED'
+		# Set by request_stop(); _wake (an asyncio.Event bound to the waiting thread's loop) cuts
+		# connect backoffs and the main loop's minute wait short
+		self._stop_requested = False
+		self._wake = None
+		self._wake_loop = None
 		self._connection_timeout = max(1, int(timeout))
 		self._defer_connection = bool(defer_connection)
 
+	@staticmethod
+	@functools.lru_cache(maxsize=8)
+	def _mismatch_suffix(requested, effective):
+		"""Log suffix noting a gateway-assigned clientId that differs from the requested one ('' if equal)."""
+		return '' if effective == requested else f" (mismatch: requested {requested} got {effective})"
+
+	def _effective_client_id(self):
+		"""Return the clientId the IB client actually holds, or None if unavailable/not an int."""
+		try:
+			cid = self.ib.client.clientId
+		except AttributeError:
+			return None
+		return cid if isinstance(cid, int) else None
+
 	def _initialize_ib_instance(self, ib):
 		if ib is not None:
 			self.ib = ib
+			cid = self._effective_client_id()
+			if cid is not None:
+				self.client_id = cid
+			self._watch_connection_events()
 			try:
-				cid = getattr(getattr(self.ib, 'client', None), 'clientId', None)
-				if isinstance(cid, int):
-					self.client_id = cid
+				if self.ib.isConnected() is True:
+					self._set_conn_state('CONNECTED')
 			except Exception:
 				pass
 		else:
 			if self._defer_connection:
 				self.ib = None
-				self._connected = False
+				self._set_conn_state('DISCONNECTED')
 			else:
 				self.ib = IB()
 				self._attempt_initial_connect()
 
 	def _configure_trade_window(self, trade_timezone, pause_before_hour, new_order_cutoff, shutdown_at):
 		self.trade_timezone = trade_timezone
+		# Resolve the ZoneInfo once; _now_in_tz reuses it on every loop iteration
+		self._trade_tz()
 		self._pause_before_hour = int(pause_before_hour)
 		try:
 			self._new_order_cutoff = (int(new_order_cutoff[0]), int(new_order_cutoff[1]))
@@ -834,8 +1219,23 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			self._shutdown_at = (int(shutdown_at[0]), int(shutdown_at[1]))
 		except Exception:
 			self._shutdown_at = (22, 50)
-		self._paused_notice_shown = False
-		self._cutoff_notice_shown = False
+		# Window boundaries as minute-of-day ints, walked by _advance_window's cursor
+		self._pause_mod = self._pause_before_hour * 60
+		self._cutoff_mod = self._new_order_cutoff[0] * 60 + self._new_order_cutoff[1]
+		self._shutdown_mod = self._shutdown_at[0] * 60 + self._shutdown_at[1]
+		# Same precedence as the per-gate checks this replaces, whatever order the arguments come in:
+		# the pause wins until it ends, then shutdown wins over cutoff. Clamping keeps the three
+		# boundaries non-decreasing, so the cursor's last phase is always SHUTDOWN.
+		shutdown_mod = max(self._pause_mod, self._shutdown_mod)
+		cutoff_mod = max(self._pause_mod, min(self._cutoff_mod, self._shutdown_mod))
+		self._transitions = (
+			(self._pause_mod, 'OPEN'),
+			(cutoff_mod, 'CUTOFF'),
+			(shutdown_mod, 'SHUTDOWN'),
+		)
+		self._next_transition_idx = 0
+		self._window_mod = -1
+		self._window_phase = None
 		self._shutdown_done = False
 		self.block_new_orders = False
 		self.current_sl_price = None
@@ -868,20 +1268,55 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		sym = getattr(self.contract, 'symbol', 'N/A')
 		ltd = getattr(self.contract, 'lastTradeDateOrContractMonth', '') or ''
 		exch = getattr(self.contract, 'exchange', 'N/A')
+		self._contract_conid()
 		self.log(f"📄 Contract initialized (qualified={self._contract_qualified}): {sym} {ltd} @ {exch}")
 
 	def _init_trade_state(self):
+		# Streaming ticker reused by get_valid_price; set here so the per-tick path reads it directly
+		self._md_tick = None
+		# Monotonic start of the streaming subscription (an age, never shown as a wall-clock time)
+		self._md_started = None
+		# _monitor_stop only trusts the streaming ticker if it updated within this many seconds
+		self._md_stale_after = 5.0
+		self._latest_market_price = None
+		self._last_entry_order = None
+		self._last_sl_order = None
+		self._last_tp_order = None
 		self._last_entry_id = None
 		self._last_sl_id = None
 		self._last_tp_id = None
 		self.trade_phase = 'IDLE'
 		self.current_direction = None
-		self._last_phase_change = datetime.datetime.now()
+		# Monotonic stamp of the last emitted phase change (immune to wall-clock/DST jumps)
+		self._last_phase_change = time.monotonic()
+		# Phases passed through with emit=False, awaiting one combined PHASE line (see _transition)
+		self._pending_phase_path = None
+		# Poll step while waiting on a streaming tick, and the minimum gap between tick-driven stop checks
+		self._tick_poll_interval = 0.25
+		self._stop_check_min_interval = 0.05
+		self._last_stop_check = 0.0
+		# Shared rate limit for _monitor_stop passes (see _monitor_stop_throttled)
+		self._monitor_stop_min_interval = 0.25
+		self._monitor_stop_last = 0.0
+		# Last price get_valid_price returned; served as source 'cache' when every live source fails,
+		# but only if the price_cache_max_age constructor option enabled it
+		self._last_known_price = None
+		self._last_known_price_ts = 0.0
+		self._last_known_price_max_age = 0.0
+		# Fallback ib.trades() fill scan cadence while orderStatusEvent is subscribed
+		self._fill_scan_safety_interval = 10.0
+		self._fill_scan_last = 0.0
 		# Track entry/exit context for PnL and ES logging
 		self.entry_ref_price = None
 		self.entry_action = None
 		self.entry_qty_sign = None  # +1 for BUY, -1 for SELL
 		self.current_tp_price = None
+		# conId-indexed positions snapshot used by has_active_position (see _positions_by_conid)
+		self._positions_cache = (0.0, None)
+		self._positions_cache_ttl = 0.5
+		# Full positions list handed to _monitor_stop; refreshed when positionEvent sets the dirty flag
+		self._positions_list = None
+		self._positions_dirty = True
 		# Optional Elasticsearch integration (off by default)
 		try:
 			self._es_enabled = bool(int(os.getenv('TRADES_ES_ENABLED', '0')))
@@ -902,10 +1337,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		if not getattr(self, '_es_enabled', False):
 			# One-time note if ES logging is disabled
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log("ℹ️ ES trade logging disabled (set TRADES_ES_ENABLED=1 to enable)")
-				except Exception:
-					pass
+				self.log("ℹ️ ES trade logging disabled (set TRADES_ES_ENABLED=1 to enable)")
 				self._es_warned = True
 			return False
 		try:
@@ -914,10 +1346,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				self._es_client = _es.get_es_client()
 				if self._es_client is None:
 					if not getattr(self, '_es_warned', False):
-						try:
-							self.log("⚠️ ES client unavailable — install elasticsearch>=8 and ensure ES_URL (default http://localhost:9200)")
-						except Exception:
-							pass
+						self.log("⚠️ ES client unavailable — install elasticsearch>=8 and ensure ES_URL (default http://localhost:9200)")
 						self._es_warned = True
 					return False
 			# Ensure trades index exists with a minimal mapping
@@ -955,10 +1384,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			return True
 		except Exception as e:
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log(f"⚠️ ES prepare failed — {e}")
-				except Exception:
-					pass
+				self.log(f"⚠️ ES prepare failed — {e}")
 				self._es_warned = True
 			return False
 
@@ -966,10 +1392,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		"""Ensure ES client and the seed/priming index with a mapping for history/priming payloads."""
 		if not getattr(self, '_es_enabled', False):
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log("ℹ️ ES logging disabled (set TRADES_ES_ENABLED=1 to enable)")
-				except Exception:
-					pass
+				self.log("ℹ️ ES logging disabled (set TRADES_ES_ENABLED=1 to enable)")
 				self._es_warned = True
 			return False
 		try:
@@ -978,10 +1401,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				self._es_client = _es.get_es_client()
 				if self._es_client is None:
 					if not getattr(self, '_es_warned', False):
-						try:
-							self.log("⚠️ ES client unavailable — install elasticsearch>=8 and ensure ES_URL (default http://localhost:9200)")
-						except Exception:
-							pass
+						self.log("⚠️ ES client unavailable — install elasticsearch>=8 and ensure ES_URL (default http://localhost:9200)")
 						self._es_warned = True
 					return False
 			import es_client as _es
@@ -1024,10 +1444,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			return True
 		except Exception as e:
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log(f"⚠️ ES prepare (seed) failed — {e}")
-				except Exception:
-					pass
+				self.log(f"⚠️ ES prepare (seed) failed — {e}")
 				self._es_warned = True
 			return False
 
@@ -1128,10 +1545,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		except Exception as e:
 			# One-time warning to avoid noisy logs
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log(f"⚠️ ES index failed — {e}")
-				except Exception:
-					pass
+				self.log(f"⚠️ ES index failed — {e}")
 				self._es_warned = True
 			return
 
@@ -1184,10 +1598,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			_es.index_doc(self._es_client, self._es_seed_index, doc)
 		except Exception as e:
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log(f"⚠️ ES seed index failed — {e}")
-				except Exception:
-					pass
+				self.log(f"⚠️ ES seed index failed — {e}")
 				self._es_warned = True
 
 	def _es_log_priming_used(self, used: list[float]) -> None:
@@ -1209,10 +1620,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			_es.index_doc(self._es_client, self._es_seed_index, doc)
 		except Exception as e:
 			if not getattr(self, '_es_warned', False):
-				try:
-					self.log(f"⚠️ ES priming index failed — {e}")
-				except Exception:
-					pass
+				self.log(f"⚠️ ES priming index failed — {e}")
 				self._es_warned = True
 
 	def _log_trade_enter_to_es(self, *, price: float, action: str, quantity_sign: int):
@@ -1228,31 +1636,52 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			exit_act = 'SELL' if ua == 'BUY' else ('BUY' if ua == 'SELL' else action)
 		self._es_log_trade('exit', price=price, action=exit_act, quantity=quantity_sign, reason=reason, pnl=pnl, entry_action=entry_act, exit_action=exit_act)
 
-	def _set_trade_phase(self, new_phase: str, *, reason: str = None):
+	def _set_trade_phase(self, new_phase: str, *, reason: str = None, emit: bool = True):
 		"""Transition trade_phase with a single structured log line.
-		Skips logging if phase unchanged.
+		Skips logging if phase unchanged. With emit=False the step is recorded but not logged; the next
+		emitting transition logs the whole path (e.g. ACTIVE -> CLOSED -> IDLE) in one line.
 		"""
 		with self._lock:
 			old = getattr(self, 'trade_phase', None)
 			if new_phase == old:
 				return
 			self.trade_phase = new_phase
-		elapsed = None
-		try:
-			if self._last_phase_change:
-				elapsed = (datetime.datetime.now() - self._last_phase_change).total_seconds()
-		except Exception:
-			elapsed = None
-		self._last_phase_change = datetime.datetime.now()
+			# Path and timing bookkeeping share the lock so concurrent transitions cannot interleave steps
+			path = getattr(self, '_pending_phase_path', None)
+			if not emit:
+				if path is None:
+					self._pending_phase_path = [old or '∅', new_phase]
+				else:
+					path.append(new_phase)
+			else:
+				self._pending_phase_path = None
+				now = time.monotonic()
+				last = getattr(self, '_last_phase_change', None)
+				elapsed = now - last if last is not None else None
+				self._last_phase_change = now
+		if not emit:
+			if getattr(self, '_bin_fd', None) is not None:
+				self._write_bin(_BIN_KIND_PHASE, _PHASE_IDS.get(new_phase, 255), math.nan)
+			return
 		frag = f" ({reason})" if reason else ''
+		steps = ' -> '.join(path + [new_phase]) if path else f"{old or '∅'} -> {new_phase}"
 		try:
 			if elapsed is not None:
-				self.log(f"🔄 PHASE {old or '∅'} -> {new_phase}{frag} | {elapsed:.2f}s in prev phase")
+				self.log(f"🔄 PHASE {steps}{frag} | {elapsed:.2f}s in prev phase")
 			else:
-				self.log(f"🔄 PHASE {old or '∅'} -> {new_phase}{frag}")
+				self.log(f"🔄 PHASE {steps}{frag}")
 		except Exception:
 			pass
+		if getattr(self, '_bin_fd', None) is not None:
+			self._write_bin(_BIN_KIND_PHASE, _PHASE_IDS.get(new_phase, 255), elapsed if elapsed is not None else math.nan)
 
+	def _transition(self, phases, *, reason: str = None):
+		"""Walk through phases in order, logging one combined PHASE line for the whole path."""
+		for phase in phases[:-1]:
+			self._set_trade_phase(phase, reason=reason, emit=False)
+		self._set_trade_phase(phases[-1], reason=reason)
+
+	@log_calls
 	def _perform_startup_test_order(self):
 		"""Place a small test order and cancel it after a short delay, once per instance."""
 		if self._test_order_done or not self._test_order_enabled:
@@ -1305,16 +1734,30 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		finally:
 			self._test_order_done = True
 
+	def _build_bracket(self, action, exit_action, quantity, sl_price, tp_price):
+		"""Return (entry, sl, tp) orders; only tp transmits, releasing the whole group at once.
+
+		On a live IB connection the three orderIds are reserved up front, as IB.bracketOrder does,
+		so the children reference their parent before anything is sent. The entry stays a market
+		order (IB.bracketOrder would make it a limit), and SL precedes TP so TP is the transmitting leg.
+		"""
+		entry = MarketOrder(action, quantity)
+		entry.transmit = False
+		sl = StopOrder(exit_action, quantity, sl_price)
+		sl.transmit = False
+		tp = LimitOrder(exit_action, quantity, tp_price)
+		tp.transmit = True
+		if isinstance(self.ib, IB):
+			get_id = self.ib.client.getReqId
+			entry.orderId = get_id()
+			sl.orderId = get_id()
+			tp.orderId = get_id()
+			sl.parentId = tp.parentId = entry.orderId
+		return entry, sl, tp
+
+	@log_calls
 	def place_bracket_order(self, action, quantity, tick_size, sl_ticks, tp_ticks_long, tp_ticks_short):
-		import threading
 		def _order_thread():
-			# Ensure asyncio event loop exists in this thread
-			import asyncio
-			try:
-				asyncio.get_event_loop()
-			except RuntimeError:
-				loop = asyncio.new_event_loop()
-				asyncio.set_event_loop(loop)
 			# Thread-safe gating for order placement
 			if not self.can_place_order():
 				self.log("🚫 Order placement blocked by gating (ORDER_PLACING or other condition)")
@@ -1334,11 +1777,14 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 					# Wait briefly for fields to populate
 					ref_price = None
 					source = None
-					for _ in range(10):  # ~2s total
-						self.ib.sleep(0.2)
-						source, ref_price = self._pick_price(tick)
-						if source is not None:
-							break
+					if self._can_await_tick(tick):
+						source, ref_price = self.ib.run(self._wait_for_tick_price(tick, 2.0))
+					else:
+						for _ in range(10):  # ~2s total
+							self.ib.sleep(0.2)
+							source, ref_price = self._pick_price(tick)
+							if source is not None:
+								break
 					if source is None:
 						self.log("⚠️ No valid price — skipping order")
 						return
@@ -1356,8 +1802,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 					self.log(f"📌 Entry ref price from {source}: {ref_price}")
 					self.log(f"🎯 TP: {tp_price} | 🛡️ SL: {sl_price}")
 					self.current_sl_price = sl_price
-					entry_order = MarketOrder(action, quantity)
-					entry_order.transmit = False
+					entry_order, sl_order, tp_order = self._build_bracket(action, exit_action, quantity, sl_price, tp_price)
 					self.ib.placeOrder(contract, entry_order)
 					# Ensure entry has an orderId before creating children (defensive for adapters/mocks)
 					for _ in range(20):  # ~2s max
@@ -1373,8 +1818,6 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 							pass
 						return
 
-					sl_order = StopOrder(exit_action, quantity, sl_price)
-					sl_order.transmit = False
 					sl_order.parentId = entry_id
 					try:
 						self.ib.placeOrder(contract, sl_order)
@@ -1387,8 +1830,6 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 							pass
 						return
 
-					tp_order = LimitOrder(exit_action, quantity, tp_price)
-					tp_order.transmit = True
 					tp_order.parentId = entry_id
 					try:
 						self.ib.placeOrder(contract, tp_order)
@@ -1435,6 +1876,8 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 					self._last_entry_id = entry_id
 					self._last_sl_id = getattr(sl_order, 'orderId', None)
 					self._last_tp_id = getattr(tp_order, 'orderId', None)
+					# SL/TP fills are then delivered by orderStatusEvent instead of per-tick trades() scans
+					self._watch_order_status()
 					# Set direction & track entry context for exit PnL & ES logging
 					self.current_direction = 'LONG' if action.upper() == 'BUY' else 'SHORT'
 					self.entry_ref_price = ref_price
@@ -1445,14 +1888,15 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 					confirmed = False
 					try:
 						# Wait up to 10 seconds for any of the bracket orders to reach 'Submitted' or 'Filled' status
+						bracket_ids = {entry_id, getattr(sl_order, 'orderId', None), getattr(tp_order, 'orderId', None)}
 						for _ in range(20):
 							trades = self.ib.trades()
 							for tr in trades:
-								order = getattr(tr, 'order', None)
-								status = getattr(tr, 'orderStatus', None)
-								oid = getattr(order, 'orderId', None)
-								st = (getattr(status, 'status', '') or '').lower()
-								if oid in {entry_id, getattr(sl_order, 'orderId', None), getattr(tp_order, 'orderId', None)} and st in ('submitted', 'filled'):
+								# Cheap id filter first; the status is only normalised for our own three orders
+								if getattr(getattr(tr, 'order', None), 'orderId', None) not in bracket_ids:
+									continue
+								st = (getattr(getattr(tr, 'orderStatus', None), 'status', '') or '').lower()
+								if st in ('submitted', 'filled'):
 									confirmed = True
 									break
 							if confirmed:
@@ -1497,20 +1941,61 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			except Exception:
 				pass
 			self._set_trade_phase('BRACKET_SENT', reason=f'Bracket not confirmed by IBKR after {max_retries} attempts')
-		t = threading.Thread(target=_order_thread)
+		# Worker gets its own event loop for the duration of the placement (see _in_worker_loop)
+		t = threading.Thread(target=functools.partial(self._in_worker_loop, _order_thread))
 		t.daemon = True
 		t.start()
 
+	@log_calls
+	def _monitor_stop_throttled(self):
+		"""Run _monitor_stop at most once per _monitor_stop_min_interval across all callers.
+
+		Each pass issues a snapshot request and waits on it, so back-to-back callers within the
+		interval reuse the current stop instead of hitting the gateway again.
+		"""
+		now = time.monotonic()
+		if now - self._monitor_stop_last < self._monitor_stop_min_interval:
+			return self.current_sl_price
+		self._monitor_stop_last = now
+		return self._monitor_stop(self._positions_snapshot())
+
+	def _fresh_streaming_price(self):
+		"""Price from the streaming ticker, or None if there is none, the connection is down,
+		or the ticker has not updated within _md_stale_after seconds."""
+		tick = self._md_tick
+		if not self._tick_is_live(tick) or not self.ib.isConnected():
+			return None
+		stamp = tick.time
+		if stamp is None:
+			return None
+		if (datetime.datetime.now(stamp.tzinfo) - stamp).total_seconds() > self._md_stale_after:
+			return None
+		return self._pick_price(tick)[1]
+
 	def _monitor_stop(self, positions):
 		contract = self.contract
 		if self.current_sl_price is None:
 			return None
-		tick = self.ib.reqMktData(contract, snapshot=True)
-		self.ib.sleep(1)
-		market_price = tick.last or tick.close or tick.ask or tick.bid
-		for p in positions:
-			if p.contract.conId != contract.conId:
-				continue
+		# Only non-flat positions on this contract matter (same rule as _positions_by_conid);
+		# without one there is nothing to protect, so skip the snapshot round-trip entirely
+		algo_conid = self._contract_conid()
+		matching = [p for p in positions if p.contract.conId == algo_conid and p.position]
+		if not matching:
+			return self.current_sl_price
+		# A recently updated streaming ticker costs no request or wait; anything older gets a fresh snapshot
+		market_price = self._fresh_streaming_price()
+		if market_price is None:
+			tick = self.ib.reqMktData(contract, snapshot=True)
+			if self._can_await_tick(tick):
+				# Return as soon as the snapshot fills in rather than always waiting the full second
+				self.ib.run(self._wait_for_tick_price(tick, 1.0))
+			else:
+				self.ib.sleep(1)
+			# Same priority as _pick_price; a plain `or` chain would pick NaN since NaN is truthy
+			market_price = self._pick_price(tick)[1]
+		if market_price is None:
+			return self.current_sl_price
+		for p in matching:
 			position_side = 'LONG' if p.position > 0 else 'SHORT'
 			sl_hit = (
 				position_side == 'LONG' and market_price <= self.current_sl_price or
@@ -1573,8 +2058,9 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				close_order = MarketOrder(action, abs(p.position))
 				self.ib.placeOrder(close_contract, close_order)
 				self.log(f"❌ Manual close: {action} {abs(p.position)}")
-				for order in self.ib.orders():
-					self.ib.cancelOrder(order)
+				if not self._send_global_cancel():
+					for order in self.ib.orders():
+						self.ib.cancelOrder(order)
 				self.log("❌ All open orders cancelled after SL breach")
 				# ES logging for exit (SL breach)
 				try:
@@ -1597,15 +2083,23 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				self._last_sl_id = None
 				self._last_tp_id = None
 				self.current_direction = None
-				self._set_trade_phase('CLOSED', reason='Manual SL close')
-				self._set_trade_phase('IDLE', reason='Reset after SL')
+				self._transition(('CLOSED', 'IDLE'), reason='Manual SL close')
 				return None
 		return self.current_sl_price
 	def _check_fills_and_reset_state(self):
-		"""Scan ib.trades() for fills of tracked SL/TP and reset trade state."""
+		"""Scan ib.trades() for fills of tracked SL/TP and reset trade state.
+
+		While orderStatusEvent is delivering fills to _on_order_status for this IB instance, the scan only
+		runs as a safety net every _fill_scan_safety_interval seconds (in case an event was missed).
+		"""
 		try:
 			if self._last_sl_id is None and self._last_tp_id is None:
 				return
+			if getattr(self, '_order_status_watched_ib', None) is self.ib:
+				now = time.monotonic()
+				if now - self._fill_scan_last < self._fill_scan_safety_interval:
+					return
+				self._fill_scan_last = now
 			try:
 				trades = self.ib.trades()
 			except Exception:
@@ -1617,51 +2111,10 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 					if order is None or status is None:
 						continue
 					oid = getattr(order, 'orderId', None)
-					st = (getattr(status, 'status', '') or '').lower()
-					if oid in (self._last_sl_id, self._last_tp_id) and st == 'filled':
-						reason = 'SL' if oid == self._last_sl_id else 'TP'
-						self.log(f"✅ Detected {reason} fill for orderId={oid} — resetting trade state")
-						# ES logging for exit with PnL
-						try:
-							exit_price = None
-							if reason == 'SL' and isinstance(self.current_sl_price, (int, float)):
-								exit_price = float(self.current_sl_price)
-							elif reason == 'TP' and isinstance(self.current_tp_price, (int, float)):
-								exit_price = float(self.current_tp_price)
-							if exit_price is not None and isinstance(self.entry_ref_price, (int, float)) and isinstance(self.entry_qty_sign, int):
-								# Do not recalculate EMAs here; EMAs are computed once per tick in tick_prologue
-								pnl = (exit_price - self.entry_ref_price) * self.entry_qty_sign
-								# For exits, log the actual closing side: opposite of entry/position
-								entry_act = getattr(self, 'entry_action', None)
-								if entry_act in ('BUY', 'SELL'):
-									exit_action = 'SELL' if entry_act == 'BUY' else 'BUY'
-								else:
-									exit_action = 'SELL' if (self.entry_qty_sign or 1) > 0 else 'BUY'
-								self._log_trade_exit_to_es(price=exit_price, action=exit_action, quantity_sign=self.entry_qty_sign, reason=reason, pnl=pnl)
-						except Exception:
-							pass
-						self.current_sl_price = None
-						# Clear tracked bracket state
-						self._last_entry_order = None
-						self._last_sl_order = None
-						self._last_tp_order = None
-						self._last_entry_id = None
-						self._last_sl_id = None
-						self._last_tp_id = None
-						self.entry_ref_price = None
-						self.entry_action = None
-						self.entry_qty_sign = None
-						self.current_tp_price = None
-						self.current_direction = None
-						self._set_trade_phase('CLOSED', reason=f'{reason} fill')
-						try:
-							if hasattr(self, 'on_trade_closed') and callable(self.on_trade_closed):
-								self.on_trade_closed(reason=reason, trade=tr)
-							else:
-								self.reset_state()
-						except Exception:
-							pass
-						self._set_trade_phase('IDLE', reason='Post-fill reset')
+					if oid not in (self._last_sl_id, self._last_tp_id):
+						continue
+					if (getattr(status, 'status', '') or '').lower() == 'filled':
+						self._handle_bracket_fill(oid, tr)
 						break
 				except Exception:
 					# Ignore malformed trade objects and continue scanning
@@ -1669,24 +2122,135 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		except Exception:
 			return
 
+	def _watch_order_status(self):
+		"""Subscribe to orderStatusEvent (once per IB instance) so SL/TP fills arrive as callbacks."""
+		if getattr(self, '_order_status_watched_ib', None) is self.ib:
+			return
+		event = getattr(self.ib, 'orderStatusEvent', None)
+		if event is None:
+			return
+		try:
+			event += self._on_order_status
+			self._order_status_watched_ib = self.ib
+		except Exception:
+			pass
+
+	def _unwatch_order_status(self):
+		ib = getattr(self, '_order_status_watched_ib', None)
+		if ib is None:
+			return
+		self._order_status_watched_ib = None
+		try:
+			ib.orderStatusEvent -= self._on_order_status
+		except Exception:
+			pass
+
+	def _on_order_status(self, trade):
+		"""orderStatusEvent handler: reset state when the tracked SL or TP reports Filled."""
+		try:
+			oid = trade.order.orderId
+			if oid is not None and oid in (self._last_sl_id, self._last_tp_id) and trade.orderStatus.status == 'Filled':
+				self._handle_bracket_fill(oid, trade)
+		except Exception:
+			pass
+
+	def _handle_bracket_fill(self, oid, tr):
+		"""Log the exit, clear tracked bracket state and cycle the phase CLOSED -> IDLE."""
+		reason = 'SL' if oid == self._last_sl_id else 'TP'
+		self._unwatch_order_status()
+		self.log(f"✅ Detected {reason} fill for orderId={oid} — resetting trade state")
+		# ES logging for exit with PnL
+		try:
+			exit_price = None
+			if reason == 'SL' and isinstance(self.current_sl_price, (int, float)):
+				exit_price = float(self.current_sl_price)
+			elif reason == 'TP' and isinstance(self.current_tp_price, (int, float)):
+				exit_price = float(self.current_tp_price)
+			if exit_price is not None and isinstance(self.entry_ref_price, (int, float)) and isinstance(self.entry_qty_sign, int):
+				# Do not recalculate EMAs here; EMAs are computed once per tick in tick_prologue
+				pnl = (exit_price - self.entry_ref_price) * self.entry_qty_sign
+				# For exits, log the actual closing side: opposite of entry/position
+				entry_act = getattr(self, 'entry_action', None)
+				if entry_act in ('BUY', 'SELL'):
+					exit_action = 'SELL' if entry_act == 'BUY' else 'BUY'
+				else:
+					exit_action = 'SELL' if (self.entry_qty_sign or 1) > 0 else 'BUY'
+				self._log_trade_exit_to_es(price=exit_price, action=exit_action, quantity_sign=self.entry_qty_sign, reason=reason, pnl=pnl)
+		except Exception:
+			pass
+		self.current_sl_price = None
+		# Clear tracked bracket state
+		self._last_entry_order = None
+		self._last_sl_order = None
+		self._last_tp_order = None
+		self._last_entry_id = None
+		self._last_sl_id = None
+		self._last_tp_id = None
+		self.entry_ref_price = None
+		self.entry_action = None
+		self.entry_qty_sign = None
+		self.current_tp_price = None
+		self.current_direction = None
+		# CLOSED stays observable to on_trade_closed/reset_state; logged together with the IDLE reset
+		self._set_trade_phase('CLOSED', reason=f'{reason} fill', emit=False)
+		try:
+			if hasattr(self, 'on_trade_closed') and callable(self.on_trade_closed):
+				self.on_trade_closed(reason=reason, trade=tr)
+			else:
+				self.reset_state()
+		except Exception:
+			pass
+		self._set_trade_phase('IDLE', reason=f'{reason} fill')
+
+	def _send_global_cancel(self):
+		"""Cancel everything with a single reqGlobalCancel when global_cancel is enabled; True if sent.
+
+		reqGlobalCancel also cancels orders placed by other clients on the account (sibling algorithms),
+		so it is opt-in. Callers fall back to per-order cancelOrder when this returns False.
+		"""
+		if not getattr(self, '_global_cancel', False):
+			return False
+		try:
+			self.ib.reqGlobalCancel()
+			return True
+		except AttributeError:
+			return False
+
 	def cancel_all_orders(self):
 		open_orders = [o for o in self.ib.orders() if getattr(o, 'orderId', None) not in (None, 0)]
 		self.log(f"🔔 Attempting to cancel {len(open_orders)} open orders: {[getattr(o, 'orderId', None) for o in open_orders]}")
-		for order in open_orders:
-			try:
-				self.log(f"⏳ Cancelling orderId={getattr(order, 'orderId', None)}")
-				self.ib.cancelOrder(order)
-			except Exception as e:
-				self.log(f"❌ Exception cancelling orderId={getattr(order, 'orderId', None)}: {e}")
-		# Wait briefly and verify cancellation
-		self.ib.sleep(2)
-		remaining_orders = [o for o in self.ib.orders() if getattr(o, 'orderId', None) not in (None, 0)]
+		if self._send_global_cancel():
+			self.log("⏳ Sent reqGlobalCancel")
+		else:
+			for order in open_orders:
+				try:
+					self.log(f"⏳ Cancelling orderId={getattr(order, 'orderId', None)}")
+					self.ib.cancelOrder(order)
+				except Exception as e:
+					self.log(f"❌ Exception cancelling orderId={getattr(order, 'orderId', None)}: {e}")
+		# Wait briefly and verify cancellation; on a live connection stop as soon as the book is empty
+		remaining_orders = self._wait_orders_cleared(2.0)
 		if remaining_orders:
 			self.log(f"⚠️ {len(remaining_orders)} orders still open after cancel attempt: {[getattr(o, 'orderId', None) for o in remaining_orders]}")
 		else:
 			self.log("✅ All orders successfully cancelled.")
 
+	def _wait_orders_cleared(self, timeout):
+		"""Return the orders still open after waiting up to timeout seconds for cancels to land."""
+		open_orders = getattr(self.ib, 'openOrders', None)
+		if not callable(open_orders):
+			self.ib.sleep(timeout)
+			return [o for o in self.ib.orders() if getattr(o, 'orderId', None) not in (None, 0)]
+		# IB.orders() keeps every order of the session; openOrders() drops them once cancelled
+		deadline = time.monotonic() + timeout
+		while True:
+			remaining = [o for o in open_orders() if getattr(o, 'orderId', None) not in (None, 0)]
+			if not remaining or time.monotonic() >= deadline:
+				return remaining
+			self.ib.sleep(0.1)
+
 	def close_all_positions(self):
+		# placeOrder does not wait for acknowledgement, so all closes go out back to back
 		positions = self.ib.positions()
 		for p in positions:
 			if abs(p.position) > 0:
@@ -1694,23 +2258,30 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				close_order = MarketOrder(action, abs(p.position))
 				self.ib.placeOrder(p.contract, close_order)
 
+	@log_calls
 	def reconnect(self):
+		if self.is_connected():
+			self.log("🔌 Reconnect skipped: connection is up")
+			return
 		try:
 			if getattr(self, 'ib', None) is None:
 				self.ib = IB()
-			try:
-				self.ib.disconnect()
-			except Exception:
-				pass
-			time.sleep(1)
-			# Ensure event loop
-			import asyncio as _asyncio
-			try:
-				_asyncio.get_event_loop()
-			except RuntimeError:
-				loop = _asyncio.new_event_loop()
-				_asyncio.set_event_loop(loop)
-			self.ib.connect(self._ib_host, self._ib_port, clientId=self.requested_client_id)
+			self._set_conn_state('CONNECTING')
+			self._watch_connection_events()
+			self._reset_connection()
+			# Back off across consecutive failed reconnects; a short settle pause otherwise
+			failures = self._reconnect_failures
+			if failures:
+				self._backoff_sleep(failures)
+			else:
+				self._pause(1)
+			if self._stop_requested:
+				self.log("🛑 Stop requested — reconnect abandoned")
+				self._set_conn_state('DISCONNECTED')
+				return
+			self._ensure_event_loop()
+			self._connect_seq += 1
+			self._connect_with_timeout()
 			# Treat mocked connections (where connect may be a MagicMock) as connected if attribute 'connected' exists
 			if not self.ib.isConnected() and hasattr(self.ib, 'connected') and isinstance(getattr(self.ib, 'connected'), bool):
 				# Assume success for test/mocked environments
@@ -1719,28 +2290,32 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				except Exception:
 					pass
 			if self.ib.isConnected() or hasattr(self.ib, 'call_count'):
-				try:
-					if hasattr(self.ib, 'reqMarketDataType'):
-						self.ib.reqMarketDataType(3)
-				except Exception:
-					pass
-				try:
-					cid = getattr(getattr(self.ib, 'client', None), 'clientId', None)
-					if isinstance(cid, int):
-						self.client_id = cid
-				except Exception:
-					pass
+				self._ensure_market_data_type(3)
+				cid = self._effective_client_id()
+				if cid is not None:
+					self.client_id = cid
+				self._refresh_log_prefix()
 				# Always attempt qualification (mock tests rely on the call even if not truly connected)
 				try:
 					self.ib.qualifyContracts(self.contract)
 				except Exception:
 					pass
-				mismatch = '' if self.client_id == self.requested_client_id else f" (mismatch: requested {self.requested_client_id} got {self.client_id})"
-				self.log(f"🔄 Reconnected to IB ({self._ib_host}:{self._ib_port}) as clientId={self.client_id}{mismatch}")
+				self._resubscribe_market_data()
+				mismatch = self._mismatch_suffix(self.requested_client_id, self.client_id)
+				self.log(f"🔄 Reconnected to IB ({self._ib_host}:{self._ib_port}) as clientId={self.client_id}{mismatch} (seq={self._connect_seq})")
+				self._reconnect_failures = 0
+				self._set_conn_state('CONNECTED')
 			else:
 				self.log("❌ Reconnect failed: still not connected")
+				self._reconnect_failures += 1
+				self._set_conn_state('ERROR')
 		except Exception as e:
-			self.log(f"❌ Error in reconnect: {e}")
+			if self._is_unrecoverable(e):
+				self.log(f"🚫 Unrecoverable error in reconnect ({type(e).__name__}): {e}")
+			else:
+				self.log(f"❌ Error in reconnect: {e}")
+			self._reconnect_failures += 1
+			self._set_conn_state('ERROR')
 			return
 	def _start_order_placement(self, *args, **kwargs):
 		"""Thread-safe entry for order placement. Sets ORDER_PLACING state, runs placement, then updates state."""
@@ -1760,9 +2335,9 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 	def _monitor_limit(self):
 		"""Monitor if the intended limit price has been reached and exit BRACKET_SENT if so."""
 		# Only act if in BRACKET_SENT state and intended limit price is set
-		if getattr(self, 'trade_phase', None) == 'BRACKET_SENT' and hasattr(self, 'intended_limit_price'):
+		if self.trade_phase == 'BRACKET_SENT' and hasattr(self, 'intended_limit_price'):
 			limit_price = self.intended_limit_price
-			market_price = getattr(self, '_latest_market_price', None)
+			market_price = self._latest_market_price
 			if market_price is not None:
 				direction = getattr(self, 'entry_action', None)
 				limit_hit = (direction == 'BUY' and market_price >= limit_price) or (direction == 'SELL' and market_price <= limit_price)
@@ -1801,27 +2376,47 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		# Only update state, do not log trade exit event if exiting BRACKET_SENT without a real trade
 		self.current_sl_price = None
 		self.intended_limit_price = None
-		self._set_trade_phase('CLOSED', reason='Manual limit close')
-		self._set_trade_phase('IDLE', reason='Reset after limit')
+		self._transition(('CLOSED', 'IDLE'), reason='Manual limit close')
 	# When attempting to place the limit order, save the intended price
 	def _init_thread_lock(self):
 		if not hasattr(self, '_lock'):
-			self._lock = threading.Lock()
+			# Reentrant: _set_trade_phase takes it, and is reached from the tick monitor and order thread while they hold it
+			self._lock = threading.RLock()
+		# Per-thread asyncio loop handle (see _ensure_event_loop); the constructing thread gets its loop now
+		self._loop_local = threading.local()
+		self._ensure_event_loop()
 
 	def _wait_for_round_minute(self):
 		now = datetime.datetime.now()
 		wait_sec = 60 - now.second
 		self.log(f"⏳ Waiting {wait_sec} seconds for round-minute start...")
 		time.sleep(wait_sec)
-		self.log(f"🚀 Starting at {datetime.datetime.now().strftime('%H:%M:%S')}\n")
+		self.log(f"🚀 Starting at {self._timestamp()}\n")
+
+	def _now(self):
+		"""Local wall-clock now; reads within 50ms of each other share one datetime.now() call."""
+		m = time.monotonic()
+		if self._cached_now is None or m - self._cached_now_mono > 0.05:
+			self._cached_now = datetime.datetime.now()
+			self._cached_now_mono = m
+		return self._cached_now
 
 	def _now_in_tz(self):
 		"""Return current datetime in configured trading timezone."""
-		try:
-			return datetime.datetime.now(ZoneInfo(self.trade_timezone))
-		except Exception:
-			# Fallback to naive now if timezone misconfigured
-			return datetime.datetime.now()
+		tz = self._trade_tz()
+		# Fallback to naive now if timezone misconfigured
+		return datetime.datetime.now(tz) if tz is not None else datetime.datetime.now()
+
+	def _trade_tz(self):
+		"""Return ZoneInfo(trade_timezone), rebuilt only when the name changes (subclasses reassign it after init)."""
+		name = getattr(self, 'trade_timezone', None)
+		if name != getattr(self, '_tz_name', None) or not hasattr(self, '_tz'):
+			try:
+				self._tz = ZoneInfo(name)
+			except Exception:
+				self._tz = None
+			self._tz_name = name
+		return self._tz
 
 	def should_trade_now(self, now=None, *, start=None, end=None, tz=None):
 		"""Return True if current time in a timezone is within an inclusive [start, end] window.
@@ -1832,11 +2427,13 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		- If start or end is missing, returns True (no time gating).
 		"""
 		# Resolve timezone
-		_tzname = tz or getattr(self, 'trade_timezone', 'UTC')
-		try:
-			_tz = ZoneInfo(_tzname)
-		except Exception:
-			_tz = None
+		if tz is None and getattr(self, 'trade_timezone', None):
+			_tz = self._trade_tz()
+		else:
+			try:
+				_tz = ZoneInfo(tz or 'UTC')
+			except Exception:
+				_tz = None
 		# Resolve now
 		if now is None:
 			try:
@@ -1869,6 +2466,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			# On invalid inputs, do not block trading
 			return True
 
+	@log_calls
 	def run(self):
 		self._maybe_perform_deferred_connection()
 		# Perform seeding and startup tasks immediately — do not block them on round-minute wait
@@ -1893,7 +2491,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				if qualified:
 					self.contract = qualified[0]
 					self._contract_qualified = True
-				self.log(f"📄 Contract qualified in run(): conId={getattr(self.contract,'conId','n/a')}")
+				self.log(f"📄 Contract qualified in run(): conId={self._contract_conid() or 'n/a'}")
 			except Exception as e:
 				self.log(f"⚠️ Deferred qualification failed: {e}")
 
@@ -1916,26 +2514,25 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 
 	def _main_loop(self):
 		"""Primary infinite loop executing strategy ticks & housekeeping."""
-		import time as _time
 		while True:
 			try:
 				now = self._now_in_tz()
 				# Calculate seconds until next round minute
 				sleep_seconds = 60 - now.second - now.microsecond / 1_000_000
-				if sleep_seconds > 0:
-					self.ib.sleep(sleep_seconds)
+				if sleep_seconds > 0 and not self._stop_requested:
+					self._idle(sleep_seconds)
 				now = self._now_in_tz()
-				time_str = now.strftime('%H:%M:%S')
-				ctx = self._compute_time_context(now)
-				# Force-close (flatten only) — skip call entirely if feature not configured for perf
-				if self._force_close_dt is not None:
-					self._maybe_force_close(now, time_str)
-				if self._handle_pause(ctx, time_str):
+				time_str = self._hms(now)
+				if self._stop_requested:
+					self._handle_stop_request(time_str)
+					break
+				# Force-close (flatten only); a no-op unless force_close was configured
+				self._tick_force_close(now, time_str)
+				phase = self._advance_window(now, time_str)
+				if phase == 'PAUSED':
 					continue
-				self._handle_cutoff(ctx, time_str)
-				if self._handle_shutdown(ctx, time_str):
+				if phase == 'SHUTDOWN':
 					break
-				self._manual_sl_check()
 				self._pre_strategy_housekeeping()
 				# Common trading window gate for all algorithms
 				try:
@@ -1948,66 +2545,100 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			except Exception as e:
 				self._handle_loop_exception(e)
 
-	def _compute_time_context(self, now):
-		"""Return a dict of time-based control flags used in the loop."""
-		cutoff_h, cutoff_m = self._new_order_cutoff
-		shutdown_h, shutdown_m = self._shutdown_at
-		return {
-			'before_open': (now.hour < self._pause_before_hour),
-			'after_cutoff': (now.hour > cutoff_h) or (now.hour == cutoff_h and now.minute >= cutoff_m),
-			'at_or_after_shutdown': (now.hour > shutdown_h) or (now.hour == shutdown_h and now.minute >= shutdown_m),
-			'cutoff_h': cutoff_h,
-			'cutoff_m': cutoff_m,
-			'shutdown_h': shutdown_h,
-			'shutdown_m': shutdown_m,
-		}
-
-	def _handle_pause(self, ctx, time_str):
-		"""Manage pre-market pause. Returns True if loop should skip tick."""
-		if ctx['before_open']:
-			if not self._paused_notice_shown:
-				self.log(f"{time_str} 😴 Trading paused until {self._pause_before_hour:02d}:00")
-				self._paused_notice_shown = True
-			return True
-		self._paused_notice_shown = False
-		return False
+	def _idle(self, seconds):
+		"""Wait up to seconds for the next loop pass; on a live IB, request_stop() ends the wait at once."""
+		if not isinstance(self.ib, IB):
+			self.ib.sleep(seconds)
+			return
+		loop = self._ensure_event_loop()
+		if self._wake is None or self._wake_loop is not loop:
+			# The instance may be built on one thread and run on another; the event must belong to this loop
+			self._wake = asyncio.Event()
+			self._wake_loop = loop
+			if self._stop_requested:
+				# request_stop() landed before there was an event to set
+				return
+		self.ib.run(self._wait_wake(seconds))
+
+	async def _wait_wake(self, timeout):
+		try:
+			await asyncio.wait_for(self._wake.wait(), timeout)
+		except asyncio.TimeoutError:
+			pass
+
+	def request_stop(self):
+		"""Ask the main loop to cancel orders, flatten and exit; safe to call from any thread."""
+		self._stop_requested = True
+		wake, loop = self._wake, self._wake_loop
+		if wake is not None and loop is not None:
+			try:
+				loop.call_soon_threadsafe(wake.set)
+			except RuntimeError:
+				# Loop already closed; the flag alone is enough
+				pass
+
+	def _handle_stop_request(self, time_str):
+		"""Flatten like the scheduled shutdown, on request_stop()."""
+		if self._shutdown_done:
+			return
+		self.cancel_all_orders()
+		self.close_all_positions()
+		self.log(f"{time_str} 🛑 Stop requested — orders cancelled and positions closed")
+		self._shutdown_done = True
+
+	def _advance_window(self, now, time_str):
+		"""Move the trading-window cursor to now and return the phase: PAUSED, OPEN, CUTOFF or SHUTDOWN.
 
-	def _handle_cutoff(self, ctx, time_str):
-		"""Handle new-order cutoff window logic."""
-		if ctx['after_cutoff'] and not ctx['at_or_after_shutdown']:
+		The cursor only steps when a boundary in _transitions is crossed and rewinds when the minute of
+		day goes backwards (midnight). Only the phase landed on is entered, so a late start does not
+		replay the notices of the boundaries it skipped.
+		"""
+		m = now.hour * 60 + now.minute
+		if m < self._window_mod:
+			self._next_transition_idx = 0
+		self._window_mod = m
+		transitions = self._transitions
+		idx = self._next_transition_idx
+		while idx < len(transitions) and m >= transitions[idx][0]:
+			idx += 1
+		self._next_transition_idx = idx
+		phase = transitions[idx - 1][1] if idx else 'PAUSED'
+		if phase != self._window_phase:
+			self._window_phase = phase
+			self._enter_window_phase(phase, time_str)
+		return phase
+
+	def _enter_window_phase(self, phase, time_str):
+		"""One-time side effects of entering a trading-window phase."""
+		if phase == 'PAUSED':
+			self.log(f"{time_str} 😴 Trading paused until {self._pause_before_hour:02d}:00")
+		elif phase == 'CUTOFF':
 			self.block_new_orders = True
-			if not self._cutoff_notice_shown:
-				self.log(f"{time_str} ⛔ New orders blocked after {ctx['cutoff_h']:02d}:{ctx['cutoff_m']:02d}")
-				self._cutoff_notice_shown = True
+			cutoff_h, cutoff_m = self._new_order_cutoff
+			self.log(f"{time_str} ⛔ New orders blocked after {cutoff_h:02d}:{cutoff_m:02d}")
 		else:
 			self.block_new_orders = False
-			self._cutoff_notice_shown = False
-
-	def _handle_shutdown(self, ctx, time_str):
-		"""Perform shutdown actions if within shutdown window. Returns True if loop should break."""
-		if ctx['at_or_after_shutdown'] and not self._shutdown_done:
-			self.cancel_all_orders()
-			self.log(f"{time_str} ❌ All open orders cancelled")
-			self.close_all_positions()
-			self.log(f"{time_str} 🛑 Trading shutdown executed at {ctx['shutdown_h']:02d}:{ctx['shutdown_m']:02d}")
-			self._shutdown_done = True
-			return True
-		return False
-
-	def _manual_sl_check(self):
-		"""Manual SL check is now handled by the tick event handler; no action needed here."""
-		pass
+			if phase == 'SHUTDOWN' and not self._shutdown_done:
+				self.cancel_all_orders()
+				self.log(f"{time_str} ❌ All open orders cancelled")
+				self.close_all_positions()
+				shutdown_h, shutdown_m = self._shutdown_at
+				self.log(f"{time_str} 🛑 Trading shutdown executed at {shutdown_h:02d}:{shutdown_m:02d}")
+				self._shutdown_done = True
 
 	def _pre_strategy_housekeeping(self):
-		"""Tasks executed once per loop prior to on_tick (fills scanning)."""
+		"""Tasks executed once per loop prior to on_tick (fills scanning; a no-op while no bracket legs are tracked)."""
 		try:
 			self._check_fills_and_reset_state()
-		except Exception:
-			pass
+		except _TRANSIENT_IB_ERRORS as e:
+			self.log(f"⚠️ check_fills transient: {e}")
+		except Exception as e:
+			self.log_exception(e, context="check_fills")
 
 	def _handle_loop_exception(self, exc):
 		"""Centralized loop exception handling (excludes SystemExit)."""
-		self.log_exception(exc, context=datetime.datetime.now().strftime('%H:%M:%S'))
+		# log() already stamps every line; no caller-side time formatting on the error path
+		self.log_exception(exc)
 		# Performance optimization: when running under test with a lightweight mock IB (has call_count),
 		# skip expensive reconnect attempts and sleeps to keep error handling overhead bounded.
 		ib_ref = getattr(self, 'ib', None)
@@ -2059,17 +2690,18 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			self._handle_active_position(time_str)
 
 		# Log if order placement is in progress, but do not return early
-		with self._lock:
-			if getattr(self, 'trade_phase', None) == 'ORDER_PLACING':
-				self.log(f"Order placement in progress at {time_str}")
+		if self.trade_phase == 'ORDER_PLACING':
+			self.log(f"Order placement in progress at {time_str}")
 		# Use the latest market price from tick event
-		price = getattr(self, '_latest_market_price', None)
+		price = self._latest_market_price
 		if price is not None:
 			self.update_price_history(price)
 			self.prev_market_price = price
 		# Monitor stop-loss for all strategies
 		try:
-			self._monitor_stop(self.ib.positions())
+			self._monitor_stop_throttled()
+		except _TRANSIENT_IB_ERRORS as e:
+			self.log(f"⚠️ {time_str} monitor_stop transient: {e}")
 		except Exception as e:
 			self.log_exception(e, context=f"on_tick_common/monitor_stop {time_str}")
 
@@ -2202,7 +2834,9 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			for close in self.close_history:
 				if not filtered or close != filtered[-1]:
 					filtered.append(close)
-			self.tp_history = filtered[-max(min(cap, len(filtered)), bars_needed):]
+			# Seed straight into the bounded deque update_price_history appends to, so the first live tick does not copy it
+			window = max(cap, bars_needed)
+			self.tp_history = deque(filtered, maxlen=window)
 			# For backward compatibility, keep price_history as tp_history
 			self.price_history = self.tp_history
 			added = len(self.tp_history)
@@ -2210,7 +2844,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			# Dump closes used for priming (tp_history)
 			try:
 				used_n = min(len(self.tp_history), bars_needed)
-				used = self.tp_history[-used_n:]
+				used = self._tail(self.tp_history, used_n)
 				entries = [f"#{i+1}:{v}" for i, v in enumerate(used)]
 				chunk = 50
 				for i in range(0, len(entries), chunk):
@@ -2220,24 +2854,25 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 				pass
 			# Export close_history and tp_history to CSV
 			try:
+				written_at = self._now().isoformat(timespec='seconds')
 				if getattr(self, '_seed_csv_path', None):
 					rows = []
 					for idx, close in enumerate(self.close_history, start=1):
-						rows.append([datetime.datetime.now().isoformat(timespec='seconds'), idx, close])
+						rows.append([written_at, idx, close])
 					self._append_csv_rows(self._seed_csv_path, ['written_at', 'index', 'close'], rows)
 					self.log(f"📤 Exported {len(rows)} closes to CSV: {os.path.basename(self._seed_csv_path)}")
 				# Also export tp_history to a separate CSV for diagnostics
 				if getattr(self, '_seed_csv_path', None):
 					tp_rows = []
 					for idx, close in enumerate(self.tp_history, start=1):
-						tp_rows.append([datetime.datetime.now().isoformat(timespec='seconds'), idx, close])
+						tp_rows.append([written_at, idx, close])
 					tp_csv_path = self._seed_csv_path.replace('.csv', '_tp.csv')
 					self._append_csv_rows(tp_csv_path, ['written_at', 'index', 'close'], tp_rows)
 					self.log(f"📤 Exported {len(tp_rows)} TP closes to CSV: {os.path.basename(tp_csv_path)}")
 				if getattr(self, '_priming_csv_path', None):
 					used_n = min(len(self.tp_history), bars_needed)
-					used = self.tp_history[-used_n:]
-					rows = [[datetime.datetime.now().isoformat(timespec='seconds'), i+1, v] for i, v in enumerate(used)]
+					used = self._tail(self.tp_history, used_n)
+					rows = [[written_at, i+1, v] for i, v in enumerate(used)]
 					self._append_csv_rows(self._priming_csv_path, ['written_at', 'index', 'close'], rows)
 					self.log(f"📤 Exported {len(rows)} priming closes to CSV: {os.path.basename(self._priming_csv_path)}")
 			except Exception:
@@ -2245,7 +2880,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			# Also export the exact used closes for priming to Elasticsearch (single doc)
 			try:
 				used_n = min(len(self.tp_history), bars_needed)
-				used = self.tp_history[-used_n:]
+				used = self._tail(self.tp_history, used_n)
 				self._es_log_priming_used(used)
 			except Exception:
 				pass
@@ -2268,10 +2903,7 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 			if cur < need:
 				added = self.seed_price_history(bars_needed=need, minutes=minutes, cap=500, extend=False)
 				if added > 0:
-					try:
-						self.log(f"🧰 Auto-seed primed {added} bars for initial indicators")
-					except Exception:
-						pass
+					self.log(f"🧰 Auto-seed primed {added} bars for initial indicators")
 			# Whether we added or already had enough, prime indicators if we have sufficient history
 			try:
 					# Prime indicators as long as we have some history; each indicator checks its own required period.
@@ -2289,134 +2921,153 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		- Multi-EMAs if multi_ema_spans/_multi_emas are present
 		- CCI if CCI_PERIOD and a calculator exist (prefer subclass calculate_and_log_cci)
 		"""
-		closes = list(getattr(self, 'price_history', []) or [])
-		if not closes:
+		history = getattr(self, 'price_history', None) or []
+		# Bail out before copying history or reading the clock when no indicator can be primed yet
+		min_needed = self._min_prime_len()
+		if min_needed is None or len(history) < min_needed:
 			return
-		# Prefer subclass timezone-aware time string for logs
+		closes = list(history)
 		try:
+			# One clock read drives both the log time and the CSV written_at stamp (converted back to local,
+			# like the seed/TP/priming CSVs)
 			now = self._now_in_tz()
-			time_str = now.strftime('%H:%M:%S')
-		except Exception:
-			time_str = datetime.datetime.now().strftime('%H:%M:%S')
-		# EMA fast/slow
-		try:
+			time_str = self._hms(now)
+			n = len(closes)
+			# EMA fast/slow
 			fast_period = getattr(self, 'EMA_FAST_PERIOD', None)
 			slow_period = getattr(self, 'EMA_SLOW_PERIOD', None)
-			if isinstance(fast_period, int) and len(closes) >= fast_period:
-				alpha = 2/(fast_period+1)
-				ema = closes[0]
-				for p in closes[1:]:
-					ema = p*alpha + ema*(1-alpha)
-				self.ema_fast = round(ema, 4)
-			if isinstance(slow_period, int) and len(closes) >= slow_period:
-				alpha = 2/(slow_period+1)
-				ema = closes[0]
-				for p in closes[1:]:
-					ema = p*alpha + ema*(1-alpha)
-				self.ema_slow = round(ema, 4)
-		except Exception:
-			pass
-		# Multi-EMAs (diagnostics-friendly)
-		try:
 			spans = getattr(self, 'multi_ema_spans', None)
-			if spans and isinstance(spans, (list, tuple, set)):
-				if not hasattr(self, '_multi_emas') or self._multi_emas is None:
+			if not (spans and isinstance(spans, (list, tuple, set))):
+				spans = None
+			# All EMAs are computed together in one pass; shared periods are computed once
+			wanted = [p for p in (fast_period, slow_period, *(spans or ())) if isinstance(p, int) and 0 < p <= n]
+			emas = self._ema_multi(closes, wanted)
+			if fast_period in emas:
+				self.ema_fast = emas[fast_period]
+			if slow_period in emas:
+				self.ema_slow = emas[slow_period]
+			# Multi-EMAs (diagnostics-friendly)
+			if spans:
+				if getattr(self, '_multi_emas', None) is None:
 					self._multi_emas = {}
+				histories = getattr(self, '_multi_ema_histories', None)
 				for span in spans:
-					if isinstance(span, int) and len(closes) >= span:
-						alpha = 2/(span+1)
-						ema = closes[0]
-						for p in closes[1:]:
-							ema = p*alpha + ema*(1-alpha)
-						self._multi_emas[span] = round(ema, 4)
+					if span in emas:
+						self._multi_emas[span] = emas[span]
 						# Maintain short history buffers if present
-						try:
-							if hasattr(self, '_multi_ema_histories') and span in self._multi_ema_histories:
-								self._multi_ema_histories[span].append(self._multi_emas[span])
-						except Exception:
-							pass
+						if isinstance(histories, dict) and span in histories:
+							histories[span].append(self._multi_emas[span])
 				# Sync primary fast/slow from multi if applicable
-				try:
-					if isinstance(getattr(self, 'EMA_FAST_PERIOD', None), int):
-						self.ema_fast = self._multi_emas.get(self.EMA_FAST_PERIOD, getattr(self, 'ema_fast', None))
-					if isinstance(getattr(self, 'EMA_SLOW_PERIOD', None), int):
-						self.ema_slow = self._multi_emas.get(self.EMA_SLOW_PERIOD, getattr(self, 'ema_slow', None))
-				except Exception:
-					pass
-		except Exception:
-			pass
-		# CCI prime
-		try:
+				if isinstance(fast_period, int):
+					self.ema_fast = self._multi_emas.get(fast_period, getattr(self, 'ema_fast', None))
+				if isinstance(slow_period, int):
+					self.ema_slow = self._multi_emas.get(slow_period, getattr(self, 'ema_slow', None))
+			# CCI prime
 			cci_period = getattr(self, 'CCI_PERIOD', 14)
-			if isinstance(cci_period, int) and len(closes) >= cci_period:
+			if isinstance(cci_period, int) and cci_period > 1 and n >= cci_period:
 				cci_val = None
 				# Prefer subclass calculator for proper logging/mode
 				calc = getattr(self, 'calculate_and_log_cci', None)
 				if callable(calc):
 					cci_val = calc(closes, time_str)
 				else:
-					from statistics import mean, stdev
 					window = closes[-cci_period:]
 					avg_tp = mean(window)
-					try:
-						dev = stdev(window)
-						cci_val = 0 if dev == 0 else (window[-1] - avg_tp) / (0.015 * dev)
-					except Exception:
-						cci_val = None
+					dev = stdev(window)
+					cci_val = 0 if dev == 0 else (window[-1] - avg_tp) / (0.015 * dev)
 				if cci_val is not None:
 					self.prev_cci = cci_val
-					try:
-						if hasattr(self, 'cci_values') and isinstance(self.cci_values, list):
-							self.cci_values.append(cci_val)
-							self.cci_values = self.cci_values[-100:]
-					except Exception:
-						pass
-		except Exception:
-			pass
-		# Snapshot all calculated indicators for visibility
-		try:
-			indicators = []
-			if isinstance(getattr(self, 'EMA_FAST_PERIOD', None), int) and hasattr(self, 'ema_fast'):
-				indicators.append(f"EMA_fast({self.EMA_FAST_PERIOD})={getattr(self, 'ema_fast', None)}")
-			if isinstance(getattr(self, 'EMA_SLOW_PERIOD', None), int) and hasattr(self, 'ema_slow'):
-				indicators.append(f"EMA_slow({self.EMA_SLOW_PERIOD})={getattr(self, 'ema_slow', None)}")
-			# Multi-EMAs summary
+					self._append_cci_value(cci_val)
+			# Indicators are stored at full precision; round only for display/export
+			_r4 = self._r4
+			# Snapshot all calculated indicators for visibility
+			has_fast = isinstance(fast_period, int) and hasattr(self, 'ema_fast')
+			has_slow = isinstance(slow_period, int) and hasattr(self, 'ema_slow')
+			cci_p = getattr(self, 'CCI_PERIOD', None)
+			has_cci = isinstance(cci_p, int) and hasattr(self, 'prev_cci')
 			multi = getattr(self, '_multi_emas', None)
-			if isinstance(multi, dict) and multi:
-				ordered = ", ".join(f"{k}:{v}" for k, v in sorted(multi.items()))
-				indicators.append(f"multiEMA={{ {ordered} }}")
-			# CCI
-			if hasattr(self, 'prev_cci') and isinstance(getattr(self, 'CCI_PERIOD', None), int):
-				indicators.append(f"CCI({self.CCI_PERIOD})={getattr(self, 'prev_cci', None)}")
-			if indicators:
-				self.log(f"🧮 Indicators initialized → {' | '.join(indicators)}")
-		except Exception:
-			pass
-		# Export indicator snapshot to CSV (one row per indicator)
-		try:
+			multi = multi if isinstance(multi, dict) and multi else None
+			span_order = self._sorted_multi_ema_spans()
+			ema_fast_v = _r4(getattr(self, 'ema_fast', None))
+			ema_slow_v = _r4(getattr(self, 'ema_slow', None))
+			cci_v = getattr(self, 'prev_cci', None)
+			summary = ' | '.join(p for p in (
+				f"EMA_fast({fast_period})={ema_fast_v}" if has_fast else None,
+				f"EMA_slow({slow_period})={ema_slow_v}" if has_slow else None,
+				"multiEMA={ " + ", ".join(f"{k}:{_r4(multi[k])}" for k in span_order if k in multi) + " }" if multi else None,
+				f"CCI({cci_p})={cci_v}" if has_cci else None,
+			) if p)
+			if summary:
+				self.log(f"🧮 Indicators initialized → {summary}")
+			# Export indicator snapshot to CSV (one row per indicator)
 			if getattr(self, '_indicators_csv_path', None):
-				written_at = datetime.datetime.now().isoformat(timespec='seconds')
+				written_at = now.astimezone().replace(microsecond=0, tzinfo=None).isoformat()
 				rows = []
-				if isinstance(getattr(self, 'EMA_FAST_PERIOD', None), int) and hasattr(self, 'ema_fast'):
-					rows.append([written_at, 'EMA_fast', getattr(self, 'EMA_FAST_PERIOD', None), getattr(self, 'ema_fast', None)])
-				if isinstance(getattr(self, 'EMA_SLOW_PERIOD', None), int) and hasattr(self, 'ema_slow'):
-					rows.append([written_at, 'EMA_slow', getattr(self, 'EMA_SLOW_PERIOD', None), getattr(self, 'ema_slow', None)])
-				multi = getattr(self, '_multi_emas', None)
-				if isinstance(multi, dict) and multi:
-					for span, val in sorted(multi.items()):
-						rows.append([written_at, 'EMA', span, val])
-				if hasattr(self, 'prev_cci') and isinstance(getattr(self, 'CCI_PERIOD', None), int):
-					rows.append([written_at, 'CCI', getattr(self, 'CCI_PERIOD', None), getattr(self, 'prev_cci', None)])
+				if has_fast:
+					rows.append([written_at, 'EMA_fast', fast_period, ema_fast_v])
+				if has_slow:
+					rows.append([written_at, 'EMA_slow', slow_period, ema_slow_v])
+				if multi:
+					for span in span_order:
+						if span in multi:
+							rows.append([written_at, 'EMA', span, _r4(multi[span])])
+				if has_cci:
+					rows.append([written_at, 'CCI', cci_p, cci_v])
 				if rows:
 					self._append_csv_rows(self._indicators_csv_path, ['written_at', 'indicator', 'period', 'value'], rows)
 					self.log(f"📤 Exported {len(rows)} indicators to CSV: {os.path.basename(self._indicators_csv_path)}")
-		except Exception:
-			pass
+		except Exception as e:
+			self.log(f"⚠️ Indicator priming failed: {e}")
+
+	def _min_prime_len(self):
+		"""Return the shortest history that lets priming produce any indicator (None if none configured)."""
+		periods = (getattr(self, 'EMA_FAST_PERIOD', None), getattr(self, 'EMA_SLOW_PERIOD', None), getattr(self, 'CCI_PERIOD', 14), *(getattr(self, 'multi_ema_spans', None) or ()))
+		valid = [p for p in periods if isinstance(p, int) and p > 0]
+		return min(valid) if valid else None
+
+	def _sorted_multi_ema_spans(self):
+		"""Return the integer multi_ema_spans in ascending order (cached until the spans are reassigned)."""
+		spans = getattr(self, 'multi_ema_spans', None)
+		cached = getattr(self, '_multi_ema_sorted_cache', None)
+		if cached is None or cached[0] is not spans:
+			cached = (spans, tuple(sorted(s for s in (spans or ()) if isinstance(s, int))))
+			self._multi_ema_sorted_cache = cached
+		return cached[1]
+
+	def _multi_ema_alphas(self, spans):
+		"""Return ((span, k), ...) for the valid spans, computed once per multi_ema_spans object."""
+		cached = getattr(self, '_multi_ema_alpha_cache', None)
+		if cached is None or cached[0] is not spans:
+			pairs = []
+			for span in spans:
+				try:
+					pairs.append((span, 2/(int(span)+1)))
+				except Exception:
+					continue
+			cached = (spans, tuple(pairs))
+			self._multi_ema_alpha_cache = cached
+		return cached[1]
+
+	def _ema_multi(self, closes, periods):
+		"""Return {period: EMA} for each distinct period, seeded with the first close.
+
+		Walks closes once and advances every span per price instead of re-scanning the
+		series per period.
+		"""
+		periods = tuple(dict.fromkeys(periods))
+		if not periods or not closes:
+			return {}
+		alphas = tuple(2/(p+1) for p in periods)
+		emas = [closes[0]] * len(periods)
+		idx = range(len(periods))
+		for price in closes[1:]:
+			for i in idx:
+				emas[i] += alphas[i] * (price - emas[i])
+		return dict(zip(periods, emas))
 
 	def _append_csv_rows(self, path, headers, rows):
 		"""Append rows to a CSV file, writing the header if the file does not exist."""
 		try:
-			import csv
 			# Ensure directory exists
 			dirname = os.path.dirname(path)
 			if dirname:
@@ -2431,53 +3082,223 @@ class TradingAlgorithm(metaclass=MethodLoggingMeta):
 		except Exception:
 			pass
 
+	def _ensure_event_loop(self):
+		"""Make sure the calling thread has an asyncio event loop without the deprecated get_event_loop() probe.
+
+		The loop is remembered per thread, so connect retries and repeat calls skip the policy lookup.
+		"""
+		local = self._loop_local
+		loop = getattr(local, 'loop', None)
+		if loop is not None and not loop.is_closed():
+			return loop
+		try:
+			loop = asyncio.get_running_loop()
+		except RuntimeError:
+			try:
+				loop = asyncio.get_event_loop_policy().get_event_loop()
+			except RuntimeError:
+				loop = asyncio.new_event_loop()
+				asyncio.set_event_loop(loop)
+				local.owned = True
+		local.loop = loop
+		return loop
+
+	def _in_worker_loop(self, fn):
+		"""Run fn on a short-lived worker thread with an event loop, closing the loop afterwards if it was made for fn.
+
+		Tick monitors and order placements each run on a fresh thread; without this every one of them would
+		leave an unclosed loop (selector fd + self-pipe) behind for the garbage collector.
+		"""
+		local = self._loop_local
+		had_loop = getattr(local, 'loop', None) is not None
+		loop = self._ensure_event_loop()
+		# Marks this thread as not owning the IB loop (see _can_await_tick)
+		local.worker = True
+		try:
+			return fn()
+		finally:
+			local.worker = False
+			if not had_loop and getattr(local, 'owned', False) and not loop.is_running():
+				local.loop = None
+				local.owned = False
+				asyncio.set_event_loop(None)
+				loop.close()
+
+	def _connect_with_timeout(self):
+		"""Connect using the requested clientId, bounded by _connection_timeout.
+
+		On a live IB instance the handshake runs as connectAsync under asyncio.wait_for, so a gateway
+		that accepts the socket but never completes the API handshake cannot hang the caller.
+		A timeout surfaces as TimeoutError and is retried like any other failed attempt.
+		"""
+		if isinstance(self.ib, IB):
+			timeout = self._connection_timeout
+			try:
+				self.ib.run(asyncio.wait_for(self.ib.connectAsync(self._ib_host, self._ib_port, clientId=self.requested_client_id, timeout=timeout), timeout))
+			except asyncio.TimeoutError:
+				raise TimeoutError(f"API handshake not completed within {timeout}s")
+		else:
+			self.ib.connect(self._ib_host, self._ib_port, clientId=self.requested_client_id)
+
+	def _ensure_market_data_type(self, md_type):
+		"""Request the market data type once per API session.
+
+		The flag is cleared by disconnectedEvent (and by _reset_connection), since the gateway forgets
+		the preference when the session ends.
+		"""
+		if getattr(self, '_market_data_type_set', None) == md_type and self.ib.isConnected():
+			return
+		try:
+			if hasattr(self.ib, 'reqMarketDataType'):
+				self.ib.reqMarketDataType(md_type)
+				self._market_data_type_set = md_type
+		except Exception:
+			return
+		self._watch_connection_events()
+
+	def _watch_connection_events(self):
+		"""Subscribe once per IB instance to connectedEvent/disconnectedEvent so _conn_state follows the socket."""
+		if getattr(self, '_conn_watched_ib', None) is self.ib:
+			return
+		try:
+			connected = getattr(self.ib, 'connectedEvent', None)
+			disconnected = getattr(self.ib, 'disconnectedEvent', None)
+			if connected is not None:
+				connected += self._on_connected
+			if disconnected is not None:
+				disconnected += self._on_disconnected
+		except Exception:
+			return
+		self._conn_watched_ib = self.ib
+
+	def _set_conn_state(self, state):
+		if state != self._conn_state:
+			self._conn_state = state
+
+	def is_connected(self):
+		"""True only if the tracked state is CONNECTED and the IB socket agrees."""
+		if self._conn_state != 'CONNECTED' or self.ib is None:
+			return False
+		try:
+			return self.ib.isConnected() is True
+		except Exception:
+			return False
+
+	def _on_connected(self, *args):
+		self._set_conn_state('CONNECTED')
+
+	def _on_disconnected(self, *args):
+		self._market_data_type_set = False
+		self._drop_market_data()
+		self._set_conn_state('DISCONNECTED')
+
+	def _drop_market_data(self):
+		"""Forget the streaming ticker and the cached price; neither is updated once the connection drops."""
+		self._md_tick = None
+		self._last_known_price = None
+
+	def _resubscribe_market_data(self):
+		"""Request the streaming ticker again after a reconnect (the old one stopped updating on disconnect).
+
+		The pendingTickersEvent handler from _subscribe_market_data stays attached to the IB instance.
+		"""
+		try:
+			self._md_tick = self.ib.reqMktData(self.contract, '', False, False)
+			self._md_started = time.monotonic()
+		except Exception as e:
+			self._md_tick = None
+			self.log(f"⚠️ Failed to resubscribe streaming market data: {e}")
+
+	def _reset_connection(self):
+		"""Tear down any half-open session before connecting again.
+
+		A connect() that fails after the socket opened can leave the gateway holding our clientId;
+		disconnecting and resetting the client state makes the next attempt start clean.
+		"""
+		self._market_data_type_set = False
+		self._drop_market_data()
+		try:
+			self.ib.disconnect()
+		except Exception:
+			pass
+		reset = getattr(getattr(self.ib, 'client', None), 'reset', None)
+		if callable(reset):
+			try:
+				reset()
+			except Exception:
+				pass
+
+	def _pause(self, seconds):
+		"""Wait without starving ib_insync: on a live IB instance the wait runs the event loop
+		(tickers, order status, fills are still dispatched) and ends early on request_stop();
+		otherwise fall back to time.sleep."""
+		if isinstance(self.ib, IB):
+			self._idle(seconds)
+		else:
+			time.sleep(seconds)
+
+	def _backoff_sleep(self, attempt):
+		"""Sleep base * 2**(attempt-1), capped at _retry_max, scaled by a random +/-_retry_jitter factor
+		so several bots restarting against the same gateway don't retry in lockstep."""
+		delay = min(self._retry_max, self._retry_base * (2 ** max(0, attempt - 1)))
+		delay *= 1 + self._retry_jitter * (2.0 * self._rng.random() - 1.0)
+		self.log(f"⏳ Retrying in {delay:.2f}s (attempt {attempt})")
+		self._pause(delay)
+
+	@staticmethod
+	def _is_unrecoverable(exc):
+		"""True for connect errors that retrying cannot fix: bad arguments/rejected credentials
+		(ValueError) and local socket errors such as EADDRINUSE/EACCES. Refused or timed-out
+		connections stay recoverable since the gateway may simply be restarting."""
+		if isinstance(exc, ValueError):
+			return True
+		if isinstance(exc, OSError) and getattr(exc, 'errno', None) in (errno.EADDRINUSE, errno.EACCES):
+			return True
+		return False
+
 	def _attempt_initial_connect(self):
 		"""Attempt to connect with retries + timeout; falls back to delayed data type.
-		Sets self._connected flag. Logs each attempt and final status.
+		Drives _conn_state (CONNECTING -> CONNECTED/ERROR). Logs each attempt and final status.
 		"""
-		self._connected = False
+		self._set_conn_state('CONNECTING')
+		self._watch_connection_events()
+		# ib_insync needs a loop in the connecting thread; resolved once, not per attempt
+		self._ensure_event_loop()
 		for attempt in range(1, self._connection_attempts + 1):
 			try:
-				# Ensure an event loop exists in this thread for ib_insync
-				try:
-					asyncio.get_event_loop()
-				except RuntimeError:
-					loop = asyncio.new_event_loop()
-					asyncio.set_event_loop(loop)
-				start = time.time()
-				self.log(f"🔌 Connecting to IB {self._ib_host}:{self._ib_port} (attempt {attempt}/{self._connection_attempts}, requestedClientId={self.requested_client_id}, timeout={self._connection_timeout}s)...")
-				# ib_insync connect doesn't take a timeout param directly; enforce manually.
-				# Run connect in a thread if event loop issues arise; simpler: call directly and measure.
-				self.ib.connect(self._ib_host, self._ib_port, clientId=self.requested_client_id)
-				elapsed = time.time() - start
+				start = time.monotonic()
+				self._connect_seq += 1
+				self.log(f"🔌 Connecting to IB {self._ib_host}:{self._ib_port} (attempt {attempt}/{self._connection_attempts}, seq={self._connect_seq}, requestedClientId={self.requested_client_id}, timeout={self._connection_timeout}s)...")
+				self._connect_with_timeout()
+				elapsed = time.monotonic() - start
 				if not self.ib.isConnected():
 					raise RuntimeError("connect() returned but not connected")
 				# Market data type preference
-				try:
-					if hasattr(self.ib, 'reqMarketDataType'):
-						self.ib.reqMarketDataType(3)
-				except Exception:
-					pass
-				self._connected = True
+				self._ensure_market_data_type(3)
+				self._set_conn_state('CONNECTED')
 				# Determine effective gateway-assigned client id
-				try:
-					cid = getattr(getattr(self.ib, 'client', None), 'clientId', None)
-					if isinstance(cid, int):
-						self.client_id = cid
-				except Exception:
-					pass
-				mismatch = '' if self.client_id == self.requested_client_id else f" (mismatch: requested {self.requested_client_id} got {self.client_id})"
+				cid = self._effective_client_id()
+				if cid is not None:
+					self.client_id = cid
+				self._refresh_log_prefix()
+				mismatch = self._mismatch_suffix(self.requested_client_id, self.client_id)
 				self.log(f"✅ Connected to IB Gateway ({self._ib_host}:{self._ib_port}) in {elapsed:.2f}s as clientId={self.client_id}{mismatch}")
 				break
 			except Exception as e:
-				self.log(f"❌ Connect attempt {attempt} failed: {e}")
-				# Disconnect defensively
-				try:
-					self.ib.disconnect()
-				except Exception:
-					pass
+				self.log("❌ Connect attempt %d (seq=%d) failed: %s", attempt, self._connect_seq, e)
+				# Release the half-open session so the retry isn't rejected for a clientId still in use
+				self._reset_connection()
+				if self._is_unrecoverable(e):
+					self.log("🚫 Unrecoverable connect error (%s); not retrying.", type(e).__name__)
+					self._set_conn_state('ERROR')
+					break
 				if attempt < self._connection_attempts:
-					time.sleep(self._connection_retry_delay)
+					self._backoff_sleep(attempt)
+					if self._stop_requested:
+						self.log("🛑 Stop requested — abandoning connect retries")
+						self._set_conn_state('DISCONNECTED')
+						break
 				else:
 					self.log("🚫 Exhausted connection attempts; continuing without active connection (will retry later).")
+					self._set_conn_state('ERROR')
 
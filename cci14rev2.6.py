@@ -1,7 +1,7 @@
 # cci14rev2.6.py חוזה לנובמבר
 from ib_insync import *
 import datetime, time, sys, math
-from statistics import stdev, mean
+from collections import deque
 
 # === הגדרות כלליות ===
 EMA_FAST_PERIOD = 10
@@ -10,14 +10,15 @@ CCI_PERIOD = 14
 K_FAST = 2 / (EMA_FAST_PERIOD + 1)
 K_SLOW = 2 / (EMA_SLOW_PERIOD + 1)
 TICK_SIZE = 0.01
+TICK_INV = 100  # 1 / TICK_SIZE: prices are snapped to whole ticks and offset in integer ticks
 SL_TICKS = 7 #17
 TP_TICKS_LONG = 10 #  28
 TP_TICKS_SHORT = 10 # 35
 QUANTITY = 1
 
 # === משתנים גלובליים ===
-price_history = []
-cci_values = []
+price_history = deque(maxlen=CCI_PERIOD)
+cci_values = deque(maxlen=100)
 prev_cci = None
 ema_fast = ema_slow = None
 paused_notice_shown = False
@@ -27,7 +28,6 @@ active_direction = None
 active_sl_order_id = None
 active_tp_order_id = None
 
-
 # === קלט מהשורת הרצה ===
 if len(sys.argv) >= 4:
     cli_price = float(sys.argv[1])
@@ -48,8 +48,26 @@ contract = Future(symbol='CL', lastTradeDateOrContractMonth='202511', exchange='
 #contract = Future(symbol='CL', lastTradeDateOrContractMonth='202510', exchange='NYMEX', currency='USD')
 ib.connect('127.0.0.1', 7497, clientId=18)
 ib.qualifyContracts(contract)
+# One streaming subscription for the whole session; its fields update whenever ib.sleep() pumps the event loop
+ticker = ib.reqMktData(contract, '', False, False)
+# Positions/trades are matched on the qualified conId; their contracts carry the full expiry date, not '202511'
+TARGET_CONID = contract.conId
+DONE_STATUSES = frozenset(('Filled', 'Cancelled'))
 print("✅ Connected to IB Gateway\n")
 
+def is_target(c):
+    if TARGET_CONID:
+        return c.conId == TARGET_CONID
+    # Qualification failed: fall back to symbol + expiry prefix
+    return c.symbol == contract.symbol and (c.lastTradeDateOrContractMonth or '').startswith(contract.lastTradeDateOrContractMonth)
+
+def current_price():
+    # Streaming fields stay NaN until the first tick of that kind arrives
+    for p in (ticker.last, ticker.close, ticker.ask, ticker.bid):
+        if isinstance(p, (int, float)) and not math.isnan(p):
+            return p
+    return None
+
 # === TEST ORDER לבדוק תקשורת ===
 test_price = round(cli_price / 2, 2)
 print(f"🧪 TEST order sent @ {test_price}")
@@ -69,9 +87,8 @@ print(f"🚀 Starting at {datetime.datetime.now().strftime('%H:%M:%S')}\n")
 # === איסוף מחירים ראשוני לחישוב CCI14 ===
 print("🔍 Preparing CCI14 calculation: collecting price history...\n")
 while len(price_history) < CCI_PERIOD:
-    tick = ib.reqMktData(contract, snapshot=True)
     ib.sleep(CHECK_INTERVAL)
-    price = tick.last or tick.close or tick.ask or tick.bid
+    price = current_price()
     if isinstance(price, (int, float)):
         price_history.append(price)
         print(f"⏳ CCI History: {len(price_history)}/{CCI_PERIOD} collected")
@@ -84,14 +101,14 @@ print("✅ CCI14 history complete — bot ready to start\n")
 ema_slow = initial_ema
 
 # === חישוב EMA10 מתוך 10 המחירים האחרונים ===
-recent_prices = price_history[-EMA_FAST_PERIOD:]
+recent_prices = list(price_history)[-EMA_FAST_PERIOD:]
 ema_fast = recent_prices[0]  # התחלה
 
 for price in recent_prices[1:]:
-    ema_fast = round(price * K_FAST + ema_fast * (1 - K_FAST), 4)
+    ema_fast = price * K_FAST + ema_fast * (1 - K_FAST)
 print(f"📊 EMA10 source prices: {recent_prices}")
 
-print(f"📈 Initial EMA10 calculated from history: {ema_fast}")
+print(f"📈 Initial EMA10 calculated from history: {ema_fast:.4f}")
 
 # === צבעים למסך (ANSI Terminal Codes) ===
 RED = "\033[91m"
@@ -99,22 +116,25 @@ GREEN = "\033[92m"
 YELLOW = "\033[93m"
 RESET = "\033[0m"
 
-# === פונקציות עזר מחזירה ערך prev_cci===
+# === פונקציות עזר מחזירה (cci, mean, mean deviation) ===
 def calculate_and_log_cci(prices, time_str):
     global prev_cci
-    if len(prices) < CCI_PERIOD:
+    n = len(prices)
+    if n < CCI_PERIOD:
         print(f"{time_str} ⚠️ Not enough data for CCI")
-        return None
+        return None, None, None
 
-    typical_prices = prices[-CCI_PERIOD:]
-    avg_tp = mean(typical_prices)
-    dev = stdev(typical_prices)
+    # Standard CCI: denominator is the mean absolute deviation (prices holds exactly the CCI window).
+    # Note: TradingAlgorithm.calculate_and_log_cci defaults to sample stdev and uses MAD only with classic_cci_mode,
+    # so this script's CCI matches the base class only in that mode.
+    avg_tp = sum(prices) / n
+    dev = sum(abs(p - avg_tp) for p in prices) / n
 
     if dev == 0:
-        print(f"{time_str} ⚠️ StdDev is zero — CCI = 0")
-        return 0
+        print(f"{time_str} ⚠️ Mean deviation is zero — CCI = 0")
+        return 0, avg_tp, dev
 
-    cci = (typical_prices[-1] - avg_tp) / (0.015 * dev)
+    cci = (prices[-1] - avg_tp) / (0.015 * dev)
 
     if cci >= 120:
         cci_display = f"{RED}{round(cci, 2)}{RESET}"
@@ -126,53 +146,61 @@ def calculate_and_log_cci(prices, time_str):
     arrow = "🔼" if prev_cci is not None and cci > prev_cci else ("🔽" if prev_cci is not None and cci < prev_cci else "⏸️")
     #position_status = "📌 ACTIVE" if is_position_open_or_pending() else "📂 NONE"
 
-    print(f"{time_str} 📊 CCI14: {cci_display} | Prev: {round(prev_cci, 2) if prev_cci is not None else '—'} {arrow} | Mean: {round(avg_tp, 2)} | StdDev: {round(dev, 2)}")
+    print(f"{time_str} 📊 CCI14: {cci_display} | Prev: {round(prev_cci, 2) if prev_cci is not None else '—'} {arrow} | Mean: {round(avg_tp, 2)} | MeanDev: {round(dev, 2)}")
 
     prev_cci = cci
-    return cci
+    return cci, avg_tp, dev
 
-def check_long_condition(cci_values):
-    return len(cci_values) >= 3 and cci_values[-3] < -120 and cci_values[-2] > -120 and cci_values[-1] > cci_values[-2] 
+# c0, c1, c2 = the last three CCI values, oldest first; the caller checks there are three
+def check_long_condition(c0, c1, c2):
+    return c0 < -120 and c1 > -120 and c2 > c1
 
-def check_short_condition(cci_values):
-    return len(cci_values) >= 3 and cci_values[-3] >= 120 and cci_values[-2] < 120 and cci_values[-1] < cci_values[-2]
+def check_short_condition(c0, c1, c2):
+    return c0 >= 120 and c1 < 120 and c2 < c1
 
-def safe_bracket_ticks(symbol, quantity, action='BUY'):
+def safe_bracket_ticks(symbol, quantity, action='BUY', pos_or_pending=None):
     global active_stop_price, active_direction, trade_active
     global active_sl_order_id, active_tp_order_id
 
-    if trade_active or is_position_open_or_pending():
+    # Callers that already scanned positions/trades this cycle pass the result in
+    if pos_or_pending is None:
+        pos_or_pending = is_position_open_or_pending()
+    if trade_active or pos_or_pending:
         print("⛔ Trade already active or position open — skipping bracket order")
         return False
 
     global contract
     #contract = Future(symbol=symbol, lastTradeDateOrContractMonth='202511', exchange='NYMEX', currency='USD')
-    tick = ib.reqMktData(contract, snapshot=True)
-    ib.sleep(1)
-    ref_price = tick.last or tick.close or tick.ask or tick.bid
+    ref_price = current_price()
 
     if not isinstance(ref_price, (int, float)):
         print("⚠️ No valid price — skipping order")
         return False
 
-    tp_ticks = TP_TICKS_LONG if action == 'BUY' else TP_TICKS_SHORT
-    tp = round(ref_price + TICK_SIZE * (tp_ticks if action == 'BUY' else -tp_ticks), 2)
-    sl = round(ref_price + TICK_SIZE * (-SL_TICKS if action == 'BUY' else SL_TICKS), 2)
+    # Everything that depends on the side, decided once
+    if action == 'BUY':
+        exit_action, sign, tp_ticks, direction = 'SELL', 1, TP_TICKS_LONG, 'LONG'
+    else:
+        exit_action, sign, tp_ticks, direction = 'BUY', -1, TP_TICKS_SHORT, 'SHORT'
+    # floor(x + 0.5) rounds to the nearest tick for negative prices too (int() would truncate toward zero)
+    ref_ticks = math.floor(ref_price * TICK_INV + 0.5)
+    tp = (ref_ticks + sign * tp_ticks) / TICK_INV
+    sl = (ref_ticks - sign * SL_TICKS) / TICK_INV
 
     active_stop_price = sl
-    active_direction = 'LONG' if action == 'BUY' else 'SHORT'
+    active_direction = direction
     trade_active = True
 
     entry_order = MarketOrder(action, quantity)
     entry_order.transmit = False
     ib.placeOrder(contract, entry_order)
 
-    sl_order = StopOrder('SELL' if action == 'BUY' else 'BUY', quantity, sl)
+    sl_order = StopOrder(exit_action, quantity, sl)
     sl_order.transmit = False
     sl_order.parentId = entry_order.orderId
     ib.placeOrder(contract, sl_order)
 
-    tp_order = LimitOrder('SELL' if action == 'BUY' else 'BUY', quantity, tp)
+    tp_order = LimitOrder(exit_action, quantity, tp)
     tp_order.transmit = True
     tp_order.parentId = entry_order.orderId
     ib.placeOrder(contract, tp_order)
@@ -186,11 +214,10 @@ def safe_bracket_ticks(symbol, quantity, action='BUY'):
 
 def is_position_open_or_pending():
     for pos in ib.positions():
-        if pos.contract.symbol == 'CL' and pos.contract.lastTradeDateOrContractMonth == '202511':
-            if pos.position != 0:
-                return True
+        if pos.position != 0 and is_target(pos.contract):
+            return True
     for trade in ib.trades():
-        if trade.contract.symbol == 'CL' and trade.orderStatus.status not in ('Filled', 'Cancelled'):
+        if trade.orderStatus.status not in DONE_STATUSES and is_target(trade.contract):
             return True
     return False
 
@@ -198,32 +225,26 @@ def is_position_open_or_pending():
 
 def close_position_manually(contract, action):
     # בדיקה אם יש פוזיציה פתוחה
-    has_position = any(
-        pos.contract.symbol == contract.symbol and
-        pos.contract.lastTradeDateOrContractMonth == contract.lastTradeDateOrContractMonth and
-        pos.position != 0
-        for pos in ib.positions()
-    )
+    has_position = any(pos.position != 0 and is_target(pos.contract) for pos in ib.positions())
 
     # בדיקה אם הוראת סטופ קיימת ופעילה
     active_sl_trade = None
     for trade in ib.trades():
-        if trade.order.orderType == 'STP' and trade.contract.symbol == contract.symbol:
-            if trade.orderStatus.status not in ('Filled', 'Cancelled'):
-                active_sl_trade = trade
-                break
+        if trade.order.orderType == 'STP' and trade.orderStatus.status not in DONE_STATUSES and is_target(trade.contract):
+            active_sl_trade = trade
+            break
 
     # תנאי סגירה ידנית
     if has_position and active_sl_trade:
-        tick = ib.reqMktData(contract, snapshot=True)
-        ib.sleep(1)
-        current_price = tick.last or tick.close or tick.ask or tick.bid
+        price = current_price()
 
         # בדיקה אם המחיר עבר את הסטופ
         sl_price = active_sl_trade.order.auxPrice
         if (
-            (action == 'BUY' and current_price >= sl_price) or
-            (action == 'SELL' and current_price <= sl_price)
+            price is not None and (
+                (action == 'BUY' and price >= sl_price) or
+                (action == 'SELL' and price <= sl_price)
+            )
         ):
             close_order = MarketOrder(action, QUANTITY)
             ib.placeOrder(contract, close_order)
@@ -242,7 +263,7 @@ def close_position_manually(contract, action):
 def close_all_positions_and_orders():
     # סגירת פוזיציות פתוחות
     for pos in ib.positions():
-        if pos.contract.symbol == 'CL' and pos.contract.lastTradeDateOrContractMonth == '202511':
+        if is_target(pos.contract):
             qty = abs(pos.position)
             if qty > 0:
                 action = 'SELL' if pos.position > 0 else 'BUY'
@@ -273,53 +294,38 @@ def reset_trade_state():
 # === פונקציית הריצה הראשית ===
 def run_bot_cycle():
     global ema_fast, ema_slow, prev_cci, paused_notice_shown, trade_active
-    global cci_values, price_history, active_direction, active_stop_price
+    global active_direction, active_stop_price
     global active_sl_order_id, active_tp_order_id
 
     now = datetime.datetime.now()
     time_str = now.strftime('%H:%M:%S')
 
-    # 📈 משיכת מחיר שוק
-    tick = ib.reqMktData(contract, snapshot=True)
-    ib.sleep(1)
-    price = tick.last or tick.close or tick.ask or tick.bid
-
-    # 🧠 בדיקה אם הוראת TP או SL מולאה — לפי מזהה
-    if active_sl_order_id or active_tp_order_id:
-        for trade in ib.trades():
-            if trade.orderStatus.status == 'Filled':
-                if trade.order.orderId == active_sl_order_id:
-                    print(f"{time_str} ✅ SL filled @ {trade.order.auxPrice} — resetting state")
-                    reset_trade_state()
-                    break
-                elif trade.order.orderId == active_tp_order_id:
-                    print(f"{time_str} ✅ TP filled @ {trade.order.lmtPrice} — resetting state")
-                    reset_trade_state()
-                    break
+    # 📈 מחיר שוק מהמנוי הזורם
+    price = current_price()
 
     if not isinstance(price, (int, float)) or math.isnan(price):
         print(f"{time_str} ⚠️ Invalid price — skipping\n")
         return
 
     # 📉 חישוב EMA
-    ema_fast = round(price * K_FAST + ema_fast * (1 - K_FAST), 4)
-    ema_slow = round(price * K_SLOW + ema_slow * (1 - K_SLOW), 4)
+    # Full precision; the 4 decimals are a display concern (see the price line below)
+    ema_fast = price * K_FAST + ema_fast * (1 - K_FAST)
+    ema_slow = price * K_SLOW + ema_slow * (1 - K_SLOW)
     ema10 = ema_fast
     ema200 = ema_slow
 
     # 📊 חישוב CCI
     price_history.append(price)
-    price_history = price_history[-CCI_PERIOD:]
-    cci = calculate_and_log_cci(price_history, time_str)
+    cci, cci_mean, cci_dev = calculate_and_log_cci(price_history, time_str)
     if cci is not None:
         cci_values.append(cci)
-        cci_values = cci_values[-100:]
 
     # 🕒 ניהול שעות מסחר
     if now.hour == 22 and now.minute == 50:
         print(f"{time_str} 🕒 22:50 — closing all positions before shutdown")
         close_all_positions_and_orders()
         reset_trade_state()
+        ib.cancelMktData(contract)
         print(f"{time_str} 💤 Trading day ended — bot shutting down")
         sys.exit()
 
@@ -345,12 +351,13 @@ def run_bot_cycle():
     if cci is not None:
         prev_cci_val = cci_values[-2] if len(cci_values) >= 2 else None
         arrow = "🔼" if prev_cci_val and cci > prev_cci_val else "🔽" if prev_cci_val and cci < prev_cci_val else "⏸️"
-        mean_price = round(mean(price_history), 2)
-        std_dev = round(stdev(price_history), 2)
-        print(f"{time_str} 📊 CCI14: {round(cci,2)} | Prev: {round(prev_cci_val,2) if prev_cci_val else '—'} {arrow} | Mean: {mean_price} | StdDev: {std_dev} | 📌 ACTIVE ({active_direction})")
+        mean_price = round(cci_mean, 2)
+        mean_dev = round(cci_dev, 2)
+        print(f"{time_str} 📊 CCI14: {round(cci,2)} | Prev: {round(prev_cci_val,2) if prev_cci_val else '—'} {arrow} | Mean: {mean_price} | MeanDev: {mean_dev} | 📌 ACTIVE ({active_direction})")
 
-    # 📌 בדיקת מצב פוזיציה
-    trade_active = is_position_open_or_pending()
+    # 📌 בדיקת מצב פוזיציה — סריקה אחת לכל מחזור
+    pos_or_pending = is_position_open_or_pending()
+    trade_active = pos_or_pending
 
     # 🛑 בדיקת סטופ ידני
     if active_direction in ["LONG", "SHORT"] and active_stop_price is not None:
@@ -366,20 +373,23 @@ def run_bot_cycle():
             return
 
     # 🧹 איפוס מצב אם אין פוזיציה בפועל
-    if not is_position_open_or_pending() and trade_active:
+    if not pos_or_pending and trade_active:
         print(f"{time_str} 🔄 No position detected — resetting trade state")
         reset_trade_state()
 
     # ✅ תנאים לכניסה לעסקה — רק אם אין עסקה פעילה
     if not trade_active and active_direction is None:
         print(f"{time_str} 🔎 Checking entry conditions...")
-        if ema_fast > ema_slow and check_long_condition(cci_values):
-            if safe_bracket_ticks('CL', QUANTITY, action='BUY'):
+        has_cci = len(cci_values) >= 3
+        if has_cci:
+            c0, c1, c2 = cci_values[-3], cci_values[-2], cci_values[-1]
+        if has_cci and ema_fast > ema_slow and check_long_condition(c0, c1, c2):
+            if safe_bracket_ticks('CL', QUANTITY, action='BUY', pos_or_pending=pos_or_pending):
                 trade_active = True
                 active_direction = "LONG"
                 print(f"{time_str} ✅ LONG signal confirmed — trade opened\n")
-        elif ema_fast < ema_slow and check_short_condition(cci_values):
-            if safe_bracket_ticks('CL', QUANTITY, action='SELL'):
+        elif has_cci and ema_fast < ema_slow and check_short_condition(c0, c1, c2):
+            if safe_bracket_ticks('CL', QUANTITY, action='SELL', pos_or_pending=pos_or_pending):
                 trade_active = True
                 active_direction = "SHORT"
                 print(f"{time_str} ✅ SHORT signal confirmed — trade opened\n")
@@ -389,6 +399,22 @@ def run_bot_cycle():
         print(f"{time_str} 🟢 TRADE ACTIVE — bot in position")
         print(f"{time_str} 🔍 No valid signal — monitoring position\n")
 
+# 🧠 מילוי TP או SL — לפי מזהה, ברגע שמגיע סטטוס
+def on_order_status(trade):
+    # Delivered while ib.sleep() pumps the event loop, so a fill resets state without waiting for the next cycle
+    if trade.orderStatus.status != 'Filled':
+        return
+    oid = trade.order.orderId
+    time_str = datetime.datetime.now().strftime('%H:%M:%S')
+    if oid == active_sl_order_id:
+        print(f"{time_str} ✅ SL filled @ {trade.order.auxPrice} — resetting state")
+        reset_trade_state()
+    elif oid == active_tp_order_id:
+        print(f"{time_str} ✅ TP filled @ {trade.order.lmtPrice} — resetting state")
+        reset_trade_state()
+
+ib.orderStatusEvent += on_order_status
+
 while True:
     run_bot_cycle()
     ib.sleep(CHECK_INTERVAL)
@@ -1,4 +1,5 @@
 import math
+from itertools import islice
 from ib_insync import IB
 from logger_setup import logger  # שימוש ב־logger אחיד מההגדרה המרכזית
 
@@ -9,14 +10,16 @@ def calculate_ema_series(series, span=10):
         logger.warning(f"⚠️ Not enough data to calculate EMA series ({span})")
         return []
 
-    ema_series = []
     alpha = 2 / (span + 1)
-    ema = sum(series[:span]) / span  # התחלה עם ממוצע פשוט
+    decay = 1 - alpha
+    ema = sum(islice(series, span)) / span  # התחלה עם ממוצע פשוט
 
-    ema_series.append(round(ema, 2))
-    for price in series[span:]:
-        ema = (price * alpha) + (ema * (1 - alpha))
-        ema_series.append(round(ema, 2))
+    ema_series = [round(ema, 2)]
+    append = ema_series.append
+    # Recurrence with loop invariants hoisted and no slice copies of the input
+    for price in islice(series, span, None):
+        ema = price * alpha + ema * decay
+        append(round(ema, 2))
 
     return ema_series
 
@@ -68,14 +71,18 @@ def fetch_initial_data(ib, contract):
         return []
 
     tp_series = []
+    append = tp_series.append
+    isfinite = math.isfinite
+    numeric = (int, float)
     for i, bar in enumerate(bars):
         try:
-            values = [bar.high, bar.low, bar.close]
-            if all(isinstance(v, (int, float)) and not math.isnan(v) and not math.isinf(v) for v in values):
-                tp = sum(values) / 3
-                tp_series.append(round(tp, 2))
+            high, low, close = bar.high, bar.low, bar.close
+            # None / non-numeric fields take the "Invalid bar" path; isfinite then rejects NaN and inf in one call
+            if (isinstance(high, numeric) and isinstance(low, numeric) and isinstance(close, numeric)
+                    and isfinite(high) and isfinite(low) and isfinite(close)):
+                append(round((high + low + close) / 3, 2))
             else:
-                logger.warning(f"⚠️ Invalid bar at index {i}: {values}")
+                logger.warning(f"⚠️ Invalid bar at index {i}: {[high, low, close]}")
         except Exception as e:
             logger.error(f"⛔ Error processing bar at index {i}: {e}")
 
@@ -122,9 +129,10 @@ def fetch_close_series(ib, contract, bars_count=200):
 
     ib.sleep(2)
 
-    close_series = []
-    for bar in bars:
-        if isinstance(bar.close, (int, float)) and not math.isnan(bar.close):
-            close_series.append(bar.close)
+    isfinite = math.isfinite
+    close_series = [
+        close for close in (bar.close for bar in bars)
+        if isinstance(close, (int, float)) and isfinite(close)
+    ]
 
     return close_series
\ No newline at end of file
@@ -30,6 +30,14 @@ def get_market_price(tick):
 
     logger.warning("⚠️ No valid market price found in tick data.")
     return None
+
+
+def first_valid_price(tick):
+    # First of last/close/ask/bid that is a real number; unlike an `or` chain, 0.0 counts and NaN does not
+    for p in (tick.last, tick.close, tick.ask, tick.bid):
+        if isinstance(p, (int, float)) and p == p:
+            return p
+    return None
     
 from ib_insync import MarketOrder
 
@@ -69,7 +77,7 @@ def place_bracket_orders(cfg, ib, quantity, action):
 
     tick = ib.reqMktData(cfg.contract, snapshot=True)
     ib.sleep(1)
-    ref_price = tick.last or tick.close or tick.ask or tick.bid
+    ref_price = first_valid_price(tick)
 
     if not isinstance(ref_price, (int, float)):
         logger.warning("⚠️ No valid price — skipping order.")
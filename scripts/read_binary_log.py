@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Decode a binary price/phase side-channel log written with binary_log=True.
+
+Usage:
+  python scripts/read_binary_log.py logs/<tag>.bin [--prices|--phases]
+"""
+from __future__ import annotations
+import math
+import struct
+import sys
+from datetime import datetime
+
+# Must match _BIN_RECORD / _PHASE_IDS in algorithms/trading_algorithms_class.py
+RECORD = struct.Struct('<dBBd')
+KIND_PRICE = 0
+KIND_PHASE = 1
+PHASE_NAMES = {0: 'IDLE', 1: 'SIGNAL_PENDING', 2: 'ORDER_PLACING', 3: 'BRACKET_SENT', 4: 'ACTIVE', 5: 'EXITING', 6: 'CLOSED'}
+
+
+def iter_records(path: str):
+    with open(path, 'rb') as fh:
+        data = fh.read()
+    usable = len(data) - len(data) % RECORD.size
+    yield from RECORD.iter_unpack(data[:usable])
+
+
+def main() -> int:
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return 1
+    only = sys.argv[2] if len(sys.argv) > 2 else None
+    for ts, kind, code, value in iter_records(sys.argv[1]):
+        stamp = datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        if kind == KIND_PRICE and only in (None, '--prices'):
+            print(f"{stamp} PRICE {value}")
+        elif kind == KIND_PHASE and only in (None, '--phases'):
+            name = PHASE_NAMES.get(code, f'#{code}')
+            suffix = '' if math.isnan(value) else f" | {value:.2f}s in prev phase"
+            print(f"{stamp} PHASE -> {name}{suffix}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
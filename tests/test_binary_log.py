@@ -0,0 +1,59 @@
+import importlib.util
+import math
+import os
+import tempfile
+import unittest
+
+from algorithms import trading_algorithms_class as tac
+from algorithms.trading_algorithms_class import TradingAlgorithm
+from tests.utils import MockIB
+
+
+def _load_reader():
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts', 'read_binary_log.py')
+    spec = importlib.util.spec_from_file_location('read_binary_log', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Algo(TradingAlgorithm):
+    def on_tick(self, time_str):
+        pass
+
+
+class BinaryLogRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        contract_params = dict(symbol='CL', lastTradeDateOrContractMonth='202512', exchange='NYMEX', currency='USD')
+        self.algo = _Algo(contract_params, client_id=999, ib=MockIB(), defer_connection=True)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'roundtrip.bin')
+        self.algo._bin_fd = os.open(self.path, tac._BIN_OPEN_FLAGS, 0o644)
+
+    def tearDown(self):
+        os.close(self.algo._bin_fd)
+        self.algo._bin_fd = None
+        self.tmp.cleanup()
+
+    def test_bin_flags_include_o_binary_where_defined(self):
+        self.assertEqual(tac._BIN_OPEN_FLAGS & getattr(os, 'O_BINARY', 0), getattr(os, 'O_BINARY', 0))
+
+    def test_records_round_trip_through_reader(self):
+        reader = _load_reader()
+        self.assertEqual(reader.RECORD.format, tac._BIN_RECORD.format)
+        # 10 == 0x0A: a newline byte inside a record must survive unchanged
+        self.algo._write_bin(tac._BIN_KIND_PRICE, 0, 10.0)
+        self.algo._write_bin(tac._BIN_KIND_PHASE, 10, math.nan)
+        self.algo._write_bin(tac._BIN_KIND_PHASE, tac._PHASE_IDS['ACTIVE'], 1.5)
+        self.assertEqual(os.path.getsize(self.path), 3 * tac._BIN_RECORD.size)
+        records = list(reader.iter_records(self.path))
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0][1:], (reader.KIND_PRICE, 0, 10.0))
+        self.assertEqual(records[1][1:3], (reader.KIND_PHASE, 10))
+        self.assertTrue(math.isnan(records[1][3]))
+        self.assertEqual(records[2][1:], (reader.KIND_PHASE, tac._PHASE_IDS['ACTIVE'], 1.5))
+        self.assertEqual(reader.PHASE_NAMES[records[2][2]], 'ACTIVE')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -61,5 +61,16 @@ class TestBracketOrderRetriesAndStatus(unittest.TestCase):
             self.algo.place_bracket_order('BUY', 1, 1.0, 5, 10, 10)
         self.assertEqual(self.algo.trade_phase, 'ACTIVE')
 
+    def test_build_bracket_legs_share_no_mutable_state(self):
+        first = self.algo._build_bracket('BUY', 'SELL', 1, 95.0, 110.0)
+        second = self.algo._build_bracket('BUY', 'SELL', 1, 94.0, 111.0)
+        for a, b in zip(first, second):
+            self.assertIsNot(a, b)
+            for name, value in vars(a).items():
+                if isinstance(value, (list, dict)):
+                    self.assertIsNot(value, getattr(b, name), name)
+        self.assertEqual((first[1].auxPrice, first[2].lmtPrice), (95.0, 110.0))
+        self.assertEqual((second[1].auxPrice, second[2].lmtPrice), (94.0, 111.0))
+
 if __name__ == '__main__':
     unittest.main()
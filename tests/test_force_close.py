@@ -41,5 +41,16 @@ class ForceCloseTests(unittest.TestCase):
         self.assertIsNotNone(self.algo._force_close_dt)
         self.assertGreater(self.algo._force_close_dt, now)
 
+    def test_force_close_uses_loop_time(self):
+        # The deadline is compared with the loop's `now`, not a fresh wall-clock read
+        now = datetime.datetime.now()
+        self.algo._force_close_dt = now + datetime.timedelta(hours=1)
+        self.algo.cancel_all_orders = MagicMock()
+        self.algo._maybe_force_close(now, now.strftime('%H:%M:%S'))
+        self.algo.cancel_all_orders.assert_not_called()
+        later = now + datetime.timedelta(hours=2)
+        self.algo._maybe_force_close(later, later.strftime('%H:%M:%S'))
+        self.algo.cancel_all_orders.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import MagicMock
+
+from algorithms.trading_algorithms_class import TradingAlgorithm
+from tests.utils import MockIB
+
+
+class _Algo(TradingAlgorithm):
+	def on_tick(self, time_str):
+		pass
+
+
+def _order(order_id):
+	return MagicMock(orderId=order_id)
+
+
+class GlobalCancelTests(unittest.TestCase):
+	def _make(self, ib, **kwargs):
+		params = dict(symbol='CL', lastTradeDateOrContractMonth='202512', exchange='NYMEX', currency='USD')
+		algo = _Algo(params, client_id=999, ib=ib, defer_connection=True, **kwargs)
+		algo.log = MagicMock()
+		return algo
+
+	def test_global_cancel_off_by_default_cancels_per_order(self):
+		ib = MagicMock()
+		orders = [_order(1), _order(2)]
+		ib.orders.return_value = orders
+		ib.openOrders.return_value = []
+		algo = self._make(ib)
+		self.assertFalse(algo._send_global_cancel())
+		algo.cancel_all_orders()
+		ib.reqGlobalCancel.assert_not_called()
+		self.assertEqual([c.args[0] for c in ib.cancelOrder.call_args_list], orders)
+
+	def test_global_cancel_enabled_sends_single_request(self):
+		ib = MagicMock()
+		ib.orders.return_value = [_order(1), _order(2)]
+		ib.openOrders.return_value = []
+		algo = self._make(ib, global_cancel=True)
+		algo.cancel_all_orders()
+		ib.reqGlobalCancel.assert_called_once()
+		ib.cancelOrder.assert_not_called()
+
+	def test_global_cancel_unsupported_falls_back(self):
+		ib = MockIB()
+		algo = self._make(ib, global_cancel=True)
+		self.assertFalse(algo._send_global_cancel())
+
+	def test_wait_orders_cleared_stops_once_book_is_empty(self):
+		ib = MagicMock()
+		ib.openOrders.side_effect = [[_order(1)], [_order(1)], []]
+		algo = self._make(ib)
+		self.assertEqual(algo._wait_orders_cleared(30.0), [])
+		self.assertEqual(ib.openOrders.call_count, 3)
+		self.assertEqual([c.args[0] for c in ib.sleep.call_args_list], [0.1, 0.1])
+
+	def test_wait_orders_cleared_returns_leftovers_after_timeout(self):
+		ib = MagicMock()
+		leftover = _order(7)
+		ib.openOrders.return_value = [leftover, _order(0)]
+		algo = self._make(ib)
+		self.assertEqual(algo._wait_orders_cleared(0.0), [leftover])
+
+	def test_wait_orders_cleared_without_open_orders_sleeps_full_timeout(self):
+		ib = MockIB()
+		ib.sleep = MagicMock()
+		ib._orders = [_order(3)]
+		algo = self._make(ib)
+		self.assertEqual(algo._wait_orders_cleared(2.0), ib._orders)
+		ib.sleep.assert_called_once_with(2.0)
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,35 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock
+
+from algorithms.trading_algorithms_class import TradingAlgorithm
+from tests.utils import MockIB
+
+
+class _Algo(TradingAlgorithm):
+	EMA_FAST_PERIOD = 3
+	EMA_SLOW_PERIOD = 5
+
+	def on_tick(self, time_str):
+		pass
+
+
+class IndicatorCsvTimestampTests(unittest.TestCase):
+	def test_indicators_written_at_is_local_like_other_csvs(self):
+		params = dict(symbol='CL', lastTradeDateOrContractMonth='202512', exchange='NYMEX', currency='USD')
+		# A trading timezone far from any CI host's local zone
+		algo = _Algo(params, client_id=999, ib=MockIB(), defer_connection=True, trade_timezone='Pacific/Kiritimati')
+		algo.log = MagicMock()
+		algo._indicators_csv_path = 'indicators.csv'
+		algo._append_csv_rows = MagicMock()
+		algo.price_history = [float(v) for v in range(1, 21)]
+		algo._prime_indicators_from_history()
+		path, headers, rows = algo._append_csv_rows.call_args.args
+		self.assertEqual(path, 'indicators.csv')
+		written_at = datetime.datetime.fromisoformat(rows[0][0])
+		self.assertIsNone(written_at.tzinfo)
+		self.assertLess(abs((datetime.datetime.now() - written_at).total_seconds()), 60)
+
+
+if __name__ == '__main__':
+	unittest.main()
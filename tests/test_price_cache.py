@@ -0,0 +1,52 @@
+import types
+import unittest
+from unittest.mock import MagicMock
+
+from algorithms.trading_algorithms_class import TradingAlgorithm
+from tests.utils import MockIB
+
+
+class _Algo(TradingAlgorithm):
+	def on_tick(self, time_str):
+		pass
+
+
+class PriceCacheTests(unittest.TestCase):
+	def _make(self, **kwargs):
+		self.ib = MockIB()
+		self.ib.sleep = MagicMock()
+		self.ib.reqHistoricalData = MagicMock(return_value=[])
+		self.tick = types.SimpleNamespace(last=101.25, close=None, ask=None, bid=None)
+		self.ib.reqMktData = MagicMock(return_value=self.tick)
+		params = dict(symbol='CL', lastTradeDateOrContractMonth='202512', exchange='NYMEX', currency='USD')
+		algo = _Algo(params, client_id=999, ib=self.ib, defer_connection=True, **kwargs)
+		algo.log = MagicMock()
+		return algo
+
+	def _go_dark(self):
+		self.tick.last = None
+
+	def test_cache_off_by_default(self):
+		algo = self._make()
+		self.assertEqual(algo._last_known_price_max_age, 0.0)
+		self.assertEqual(algo.get_valid_price(), 101.25)
+		self._go_dark()
+		self.assertIsNone(algo.get_valid_price())
+
+	def test_fresh_cached_price_is_served_from_cache(self):
+		algo = self._make(price_cache_max_age=30.0)
+		self.assertEqual(algo.get_valid_price(), 101.25)
+		self._go_dark()
+		self.assertEqual(algo.get_valid_price(), 101.25)
+		algo.log.assert_any_call("💵 Price selected from %s: %s", 'cache', 101.25)
+
+	def test_stale_cached_price_is_rejected(self):
+		algo = self._make(price_cache_max_age=30.0)
+		self.assertEqual(algo.get_valid_price(), 101.25)
+		self._go_dark()
+		algo._last_known_price_ts -= 31.0
+		self.assertIsNone(algo.get_valid_price())
+
+
+if __name__ == '__main__':
+	unittest.main()
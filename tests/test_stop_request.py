@@ -0,0 +1,90 @@
+import asyncio
+import datetime
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from algorithms import trading_algorithms_class as tac
+from algorithms.trading_algorithms_class import TradingAlgorithm
+from tests.utils import MockIB
+
+
+class _LiveIB(MockIB):
+    """MockIB that runs coroutines on the current loop, standing in for a live IB instance."""
+
+    def __init__(self):
+        super().__init__()
+        self.run_calls = 0
+
+    def run(self, coro):
+        self.run_calls += 1
+        return asyncio.get_event_loop_policy().get_event_loop().run_until_complete(coro)
+
+
+class _Algo(TradingAlgorithm):
+    def on_tick(self, time_str):
+        pass
+
+
+class StopRequestTests(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        contract_params = dict(symbol='CL', lastTradeDateOrContractMonth='202512', exchange='NYMEX', currency='USD')
+        self.ib = _LiveIB()
+        self.algo = _Algo(contract_params, client_id=999, ib=self.ib, defer_connection=True)
+        self.algo.cancel_all_orders = MagicMock()
+        self.algo.close_all_positions = MagicMock()
+        self.algo.log = MagicMock()
+        # Take the live-IB branches of _idle/_pause
+        patcher = patch.object(tac, 'IB', _LiveIB)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        asyncio.set_event_loop(None)
+        self.loop.close()
+
+    def test_stop_before_first_idle_returns_without_waiting(self):
+        self.algo.request_stop()
+        start = time.monotonic()
+        self.algo._idle(30)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(self.ib.run_calls, 0)
+
+    def test_stop_during_wait_ends_idle_early(self):
+        # First call binds the wake event to this loop
+        self.algo._idle(0.01)
+        timer = threading.Timer(0.05, self.algo.request_stop)
+        timer.start()
+        start = time.monotonic()
+        self.algo._idle(30)
+        timer.join()
+        self.assertLess(time.monotonic() - start, 5.0)
+        self.assertEqual(self.ib.run_calls, 2)
+
+    def test_main_loop_wakes_and_flattens_on_stop(self):
+        timer = threading.Timer(0.05, self.algo.request_stop)
+        with patch.object(self.algo, '_now_in_tz', return_value=datetime.datetime(2025, 1, 6, 10, 0, 0)):
+            timer.start()
+            start = time.monotonic()
+            self.algo._main_loop()
+        timer.join()
+        self.assertLess(time.monotonic() - start, 5.0)
+        self.algo.cancel_all_orders.assert_called_once()
+        self.algo.close_all_positions.assert_called_once()
+
+    def test_handle_stop_request_flattens_exactly_once(self):
+        self.algo.request_stop()
+        with patch.object(self.algo, '_now_in_tz', return_value=datetime.datetime(2025, 1, 6, 10, 0, 0)):
+            self.algo._main_loop()
+            self.algo._main_loop()
+        self.algo._handle_stop_request('10:00:00')
+        self.algo.cancel_all_orders.assert_called_once()
+        self.algo.close_all_positions.assert_called_once()
+        self.assertTrue(self.algo._shutdown_done)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import datetime
+import unittest
+from unittest.mock import MagicMock, patch
+
+from algorithms.trading_algorithms_class import TradingAlgorithm
+
+
+def _at(hour, minute):
+    return datetime.datetime(2025, 1, 6, hour, minute, 0)
+
+
+class TestTradeWindowCursor(unittest.TestCase):
+    def setUp(self):
+        self.contract_params = {
+            'symbol': 'ES',
+            'exchange': 'GLOBEX',
+            'currency': 'USD'
+        }
+        self.algo = self._make()
+
+    def _make(self, **kwargs):
+        algo = TradingAlgorithm(self.contract_params, ib=MagicMock(), **kwargs)
+        algo._lock = MagicMock()
+        algo.cancel_all_orders = MagicMock()
+        algo.close_all_positions = MagicMock()
+        algo.log = MagicMock()
+        return algo
+
+    def _advance(self, algo, hour, minute):
+        return algo._advance_window(_at(hour, minute), f"{hour:02d}:{minute:02d}:00")
+
+    def test_regular_day_walks_every_phase(self):
+        self.assertEqual(self._advance(self.algo, 7, 0), 'PAUSED')
+        self.assertEqual(self._advance(self.algo, 8, 0), 'OPEN')
+        self.assertFalse(self.algo.block_new_orders)
+        self.assertEqual(self._advance(self.algo, 22, 30), 'CUTOFF')
+        self.assertTrue(self.algo.block_new_orders)
+        self.assertEqual(self._advance(self.algo, 22, 50), 'SHUTDOWN')
+        self.algo.cancel_all_orders.assert_called_once()
+        self.algo.close_all_positions.assert_called_once()
+        self.assertTrue(self.algo._shutdown_done)
+
+    def test_late_start_lands_on_current_phase_only(self):
+        self.assertEqual(self._advance(self.algo, 22, 35), 'CUTOFF')
+        self.assertTrue(self.algo.block_new_orders)
+        # Only the cutoff notice; skipped boundaries (pause/open) are not replayed
+        self.assertEqual(self.algo.log.call_count, 1)
+        self.assertIn('New orders blocked', self.algo.log.call_args[0][0])
+
+    def test_start_after_shutdown_flattens(self):
+        self.assertEqual(self._advance(self.algo, 23, 10), 'SHUTDOWN')
+        self.algo.cancel_all_orders.assert_called_once()
+        self.algo.close_all_positions.assert_called_once()
+
+    def test_midnight_rewinds_cursor(self):
+        self._advance(self.algo, 22, 40)
+        self.assertTrue(self.algo.block_new_orders)
+        self.assertEqual(self._advance(self.algo, 0, 1), 'PAUSED')
+        self.assertEqual(self._advance(self.algo, 8, 0), 'OPEN')
+        self.assertFalse(self.algo.block_new_orders)
+
+    def test_block_new_orders_set_only_on_entry(self):
+        self._advance(self.algo, 22, 30)
+        self.algo.block_new_orders = False
+        self._advance(self.algo, 22, 31)
+        self.assertFalse(self.algo.block_new_orders)
+        self.assertEqual(self.algo.log.call_count, 1)
+
+    def test_shutdown_before_cutoff_still_shuts_down(self):
+        algo = self._make(new_order_cutoff=(22, 30), shutdown_at=(21, 0))
+        self.assertEqual(self._advance(algo, 22, 40), 'SHUTDOWN')
+        algo.cancel_all_orders.assert_called_once()
+        algo.close_all_positions.assert_called_once()
+
+    def test_pause_after_shutdown_time_still_wins_until_it_ends(self):
+        algo = self._make(pause_before_hour=23, new_order_cutoff=(22, 30), shutdown_at=(22, 50))
+        self.assertEqual(self._advance(algo, 22, 55), 'PAUSED')
+        algo.cancel_all_orders.assert_not_called()
+        self.assertEqual(self._advance(algo, 23, 0), 'SHUTDOWN')
+        algo.cancel_all_orders.assert_called_once()
+
+    def test_reentered_loop_exits_after_shutdown(self):
+        algo = self.algo
+        algo.on_tick = MagicMock()
+        with patch.object(algo, '_now_in_tz', return_value=_at(22, 55)), patch.object(algo, '_idle'):
+            algo._main_loop()
+            algo._main_loop()
+        algo.on_tick.assert_not_called()
+        algo.cancel_all_orders.assert_called_once()
+        algo.close_all_positions.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()